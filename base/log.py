@@ -8,9 +8,44 @@ except ImportError:
     # 以防某些端口名字不同
     from utime import ticks_ms, localtime, ticks_diff
 
+try:
+    from micropython import const
+except ImportError:
+    # CPython 下没有 const，退化为普通实现
+    def const(x):
+        return x
+
+try:
+    import micropython
+except ImportError:
+    # CPython 没有 micropython 模块：给 @micropython.native 一个空壳。
+    # 注意 native 只能用点号形式 @micropython.native —— 它是编译期
+    # 语法而不是模块的运行时属性，from-import 在真机上会 ImportError
+    class micropython:
+        @staticmethod
+        def native(f):
+            return f
+
+# 日志级别：被关掉的级别只花一次全局查找 + 比较就返回，
+# 完全跳过格式化、取时间和 print
+LEVEL_DEBUG = const(0)
+LEVEL_INFO  = const(1)
+LEVEL_WARN  = const(2)
+LEVEL_ERROR = const(3)
+
+LEVEL = LEVEL_INFO
+
+def set_level(level):
+    """
+    设置全局日志级别，例如 boot.py 里 log.set_level(log.LEVEL_WARN)
+    """
+    global LEVEL
+    LEVEL = level
+
 # 记录程序开始时间
 _start_ticks = ticks_ms()
 
+@micropython.native
 def _uptime_str():
     """
     返回程序运行时间，格式为 HH:MM:SS
@@ -25,26 +60,63 @@ def _uptime_str():
     except Exception:
         return "??:??:??"
 
+# 缓存最近一次格式化的时间戳：同一秒内的日志直接复用，
+# 跨秒时也只格式化秒数，"YYYY-MM-DD HH:MM:" 前缀每分钟才重建一次。
+# 缓存键必须是完整的 t[:6]：只比秒数的话，恰好相隔整分钟的两条日志
+# （周期性心跳很容易撞上）会复用几分钟前的旧时间戳
+_last_key = None
+_last_rtc = ""
+_prev_minute = None
+_prefix = ""
+
 def _rtc_str():
     """
     返回RTC时间，如果没有设置则显示运行时间
     """
+    global _last_key, _last_rtc, _prev_minute, _prefix
     try:
-        y, m, d, hh, mm, ss, *_ = localtime()
+        t = localtime()
+        key = t[:6]
+        if key == _last_key and _last_rtc:
+            return _last_rtc
         # 如果是2000年，说明RTC未设置，使用运行时间
-        if y == 2000:
-            return "UPTIME " + _uptime_str()
-        return "%04d-%02d-%02d %02d:%02d:%02d" % (y, m, d, hh, mm, ss)
+        if t[0] == 2000:
+            s = "UPTIME " + _uptime_str()
+        else:
+            minute = t[:5]
+            if minute != _prev_minute:
+                _prefix = "%04d-%02d-%02d %02d:%02d:" % minute
+                _prev_minute = minute
+            s = _prefix + ("%02d" % t[5])
+        _last_key = key
+        _last_rtc = s
+        return s
     except Exception:
         return _uptime_str()
 
+# 启动时探测一次 RTC 是否已设置：没设置（2000年）就直接绑定运行时间，
+# 每条日志省掉一次 localtime() 的日历换算和年份比较
+try:
+    _rtc_valid = localtime()[0] != 2000
+except Exception:
+    _rtc_valid = False
+
+_get_ts = _rtc_str if _rtc_valid else _uptime_str
+
+def enable_rtc():
+    """
+    NTP 同步成功后调用，把日志时间戳切回 RTC 时间
+    """
+    global _get_ts
+    _get_ts = _rtc_str
+
 def _format_ticks(ms):
     """
     格式化ticks显示，右对齐6位
     """
     return "{:>6}ms".format(ms)
 
-def _log_with_args(level, tag, format_str, *args):
+def _log_with_args(level, tag, format_str="", *args):
     """
     统一的日志格式化函数
     level: 日志级别
@@ -52,64 +124,53 @@ def _log_with_args(level, tag, format_str, *args):
     format_str: 格式字符串
     args: 参数列表
     """
-    try:
-        if args and isinstance(format_str, str):
-            # 如果有格式字符串和参数，进行格式化
+    if args:
+        try:
+            # 有参数就按 % 格式化；不是格式串会抛 TypeError，走拼接兜底
             message = format_str % args
-        else:
-            # 否则直接拼接所有参数
-            message = " ".join(str(arg) for arg in (format_str,) + args)
-    except (TypeError, ValueError):
-        # 格式化失败，直接拼接
-        message = " ".join(str(arg) for arg in (format_str,) + args)
+        except (TypeError, ValueError):
+            # 列表 append + join，避免元组拼接和生成器的临时对象
+            parts = [str(format_str)]
+            for a in args:
+                parts.append(str(a))
+            message = " ".join(parts)
+    else:
+        message = format_str if isinstance(format_str, str) else str(format_str)
 
-    print("[{}][{}][{}] {}".format(level, _rtc_str(), tag, message))
+    # %-格式在 MicroPython 上比 str.format 明显便宜
+    print("[%s][%s][%s] %s" % (level, _get_ts(), tag, message))
 
 def debug(tag, *args):
     """
     Debug 日志：带时间 + ticks_ms
     """
-    if args and isinstance(args[0], str) and '%' in args[0]:
-        # 如果第一个参数是格式字符串
-        format_str = args[0]
-        format_args = args[1:]
-        _log_with_args("DEBUG", tag, format_str, *format_args)
-    else:
-        # 否则直接拼接
-        _log_with_args("DEBUG", tag, *args)
+    if LEVEL > LEVEL_DEBUG:
+        return
+    _log_with_args("DEBUG", tag, *args)
 
 
 def info(tag, *args):
     """
     Info 日志
     """
-    if args and isinstance(args[0], str) and '%' in args[0]:
-        format_str = args[0]
-        format_args = args[1:]
-        _log_with_args("INFO", tag, format_str, *format_args)
-    else:
-        _log_with_args("INFO", tag, *args)
+    if LEVEL > LEVEL_INFO:
+        return
+    _log_with_args("INFO", tag, *args)
 
 
 def warn(tag, *args):
     """
     Warn 日志
     """
-    if args and isinstance(args[0], str) and '%' in args[0]:
-        format_str = args[0]
-        format_args = args[1:]
-        _log_with_args("WARN", tag, format_str, *format_args)
-    else:
-        _log_with_args("WARN", tag, *args)
+    if LEVEL > LEVEL_WARN:
+        return
+    _log_with_args("WARN", tag, *args)
 
 
 def error(tag, *args):
     """
     Error 日志
     """
-    if args and isinstance(args[0], str) and '%' in args[0]:
-        format_str = args[0]
-        format_args = args[1:]
-        _log_with_args("ERROR", tag, format_str, *format_args)
-    else:
-        _log_with_args("ERROR", tag, *args)
+    if LEVEL > LEVEL_ERROR:
+        return
+    _log_with_args("ERROR", tag, *args)
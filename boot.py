@@ -3,8 +3,8 @@ import sys
 for p in ("/base", "/examples"):
     if p not in sys.path:
         sys.path.append(p)
-        print(f"load module {p} done")
 import esp
 esp.osdebug(None)  # 关掉调试输出，可选
 
-print("Boot OK")
+# 启动信息合并成一次输出：每个 print 都是一次 UART 写+刷新，能省则省
+print("boot: /base /examples added; osdebug off; Boot OK")
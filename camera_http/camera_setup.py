@@ -5,7 +5,20 @@ Camera Setup for ESP32-Cam
 import camera
 from micropython import const
 
-# 摄像头配置常量 PIN_PWDN    = const(0)  # power-down
+# 热路径日志级别：0=静默 1=关键 2=调试。
+# MicroPython 的 print 是同步 UART 写，每次可达数毫秒并阻塞整个 VM，
+# 逐帧/逐请求的诊断信息默认关掉，排障时调到 2
+LOG_LEVEL = 1
+
+# 初始化阶段的逐项输出默认关闭：115200 波特率下 20 多行要 ~50ms
+VERBOSE_CAM_INIT = False
+
+def log(lvl, msg):
+    if lvl <= LOG_LEVEL:
+        print(msg)
+
+# 摄像头配置常量
+PIN_PWDN    = const(0)  # power-down
 PIN_RESET   = const(1)  # reset
 PIN_XCLK    = const(2)
 PIN_SIOD    = const(3)  # SDA
@@ -28,6 +41,9 @@ PIXFORMAT   = const(17)  # pixel format
 FRAMESIZE   = const(18)  # framesize
 JPEG_QUALITY= const(19)
 FB_COUNT    = const(20)  # framebuffer count
+CONTRAST    = const(21)  # sensor tuning
+BRIGHTNESS  = const(22)
+SATURATION  = const(23)
 
 # 像素格式
 PIXFORMAT_RGB565    = const(1)  # 2BPP/RGB565
@@ -38,7 +54,8 @@ PIXFORMAT_JPEG      = const(5)  # JPEG/COMPRESSED
 PIXFORMAT_RGB888    = const(6)  # 3BPP/RGB888
 PIXFORMAT_RAW       = const(7)  # RAW
 
-# 帧尺寸 FRAMESIZE_96X96   = const(1)   # 96x96
+# 帧尺寸
+FRAMESIZE_96X96   = const(1)   # 96x96
 FRAMESIZE_QQVGA   = const(2)   # 160x120
 FRAMESIZE_QCIF    = const(3)   # 176x144
 FRAMESIZE_HQVGA   = const(4)   # 240x176
@@ -57,7 +74,8 @@ FRAMESIZE_P_HD    = const(16)  # 720x1280
 FRAMESIZE_P_3MP   = const(17)  # 864x1536
 FRAMESIZE_QXGA    = const(18)  # 2048x1536
 
-# XIAO ESP32-S3 OV2640 摄像头配置 XIAO_CONFIG = {
+# XIAO ESP32-S3 OV2640 摄像头配置
+XIAO_CONFIG = {
     PIN_PWDN: -1,
     PIN_RESET: -1,
     PIN_XCLK: 10,
@@ -79,6 +97,11 @@ FRAMESIZE_QXGA    = const(18)  # 2048x1536
     FRAMESIZE: FRAMESIZE_VGA,
     JPEG_QUALITY: 12,
     FB_COUNT: 2,
+    # 传感器默认参数并入同一份配置，随初始化寄存器块一次写入，
+    # 省掉 init 之后三次单独的 SCCB 往返
+    CONTRAST: 2,
+    BRIGHTNESS: 0,
+    SATURATION: 0,
 }
 
 class ESP32Camera:
@@ -91,13 +114,41 @@ class ESP32Camera:
         """
         self.config = config or XIAO_CONFIG
         self.initialized = False
+        # 流式路径复用的帧缓冲池（VGA JPEG 一般 <30KB），避免逐帧堆分配。
+        # 必须是一个轮转的小池而不是单块缓冲：MJPEG 抓帧循环、UDP 推流
+        # 和 /capture 三个消费者共用同一个事件循环，各自独立调
+        # capture_frame()；单块缓冲会被下一个消费者在旧 memoryview
+        # 还没读完时覆写。池深 = 消费者数，轮转后每个视图在被复写前
+        # 至少能活过一整轮
+        self._fb_pool = tuple(bytearray(64 * 1024) for _ in range(3))
+        self._fb_idx = 0
+        self._capture_into = getattr(camera, "capture_into", None)
+        self.frame_count = 0
+        self.error_count = 0
 
     def configure(self):
         """Configure camera parameters."""
         try:
-            for key, val in self.config.items():
-                camera.conf(key, val)
-            print("Camera configuration complete")
+            conf_bulk = getattr(camera, "conf_bulk", None)
+            if conf_bulk:
+                # 一次跨越 Python->C 边界写完全部配置
+                conf_bulk(self.config)
+            else:
+                # 驱动没有批量接口时退回逐项设置，绑定局部变量减少查找。
+                # 快路径整个循环只有一个 try；只有真抛了异常才退回
+                # 逐键重试，跳过旧版模块不认识的键（如传感器调校项）
+                conf = camera.conf
+                try:
+                    for key, val in self.config.items():
+                        conf(key, val)
+                except Exception:
+                    for key, val in self.config.items():
+                        try:
+                            conf(key, val)
+                        except Exception:
+                            log(2, "camera conf key %s unsupported, skipped" % key)
+            if VERBOSE_CAM_INIT:
+                print("Camera configuration complete")
             return True
         except Exception as e:
             print(f"鎽勫儚澶撮厤缃け璐? {e}")
@@ -116,9 +167,6 @@ class ESP32Camera:
                 self.initialized = True
                 print("鎽勫儚澶村垵濮嬪寲鎴愬姛")
 
-                # 设置默认参数
-                camera.contrast(2)       # 增加对比度                camera.brightness(0)     # 亮度
-                camera.saturation(0)     # 饱和度
                 return True
             else:
                 print("鎽勫儚澶村垵濮嬪寲澶辫触")
@@ -138,15 +186,61 @@ class ESP32Camera:
             print(f"鍏抽棴鎽勫儚澶村け璐? {e}")
 
     def capture_frame(self):
-        """Capture one frame."""
+        """Capture one frame (复用预分配缓冲，不逐帧分配堆内存)."""
+        if not self.initialized:
+            log(2, "Camera not initialized")
+            return None
+
+        # 热路径不设防御性 try/except：capture 失败返回空帧而不是抛异常，
+        # 省掉每帧的异常帧建立开销
+        idx = self._fb_idx
+        self._fb_idx = idx + 1 if idx < 2 else 0
+        buf = self._fb_pool[idx]
+        if self._capture_into:
+            # 驱动直接写进我们的缓冲，零拷贝
+            n = self._capture_into(buf)
+            if not n:
+                self.error_count += 1
+                return None
+            frame = memoryview(buf)[:n]
+        else:
+            # 旧驱动只会返回新 bytes：立刻搬进复用缓冲再把原对象丢掉，
+            # 长时间运行后碎堆上反复要 ~30KB 块是 MemoryError 的主因
+            frame = camera.capture()
+            if not frame:
+                self.error_count += 1
+                return None
+            n = len(frame)
+            if n <= len(buf):
+                buf[:n] = frame
+                frame = memoryview(buf)[:n]
+            # 超大帧（低压缩率）罕见，直接透传
+
+        self.frame_count += 1
+        if self.frame_count & 127 == 0:
+            # 2 的幂掩码比 % 便宜；128 帧一条摘要，足够观察健康度
+            log(1, "frames=%d errors=%d" % (self.frame_count, self.error_count))
+        return frame
+
+    def capture_into(self):
+        """捕获一帧写入预分配缓冲，返回只含有效字节的 memoryview。"""
         if not self.initialized:
-            print("Camera not initialized")
+            log(2, "Camera not initialized")
             return None
 
         try:
+            if self._capture_into:
+                idx = self._fb_idx
+                self._fb_idx = idx + 1 if idx < 2 else 0
+                buf = self._fb_pool[idx]
+                n = self._capture_into(buf)
+                if not n:
+                    return None
+                return memoryview(buf)[:n]
+            # 驱动不支持写外部缓冲时退回普通捕获（会分配新对象）
             return camera.capture()
         except Exception as e:
-            print(f"鎹曡幏鍥惧儚澶辫触: {e}")
+            log(2, "capture_into failed: %s" % e)
             return None
 
     def set_framesize(self, size):
@@ -156,10 +250,10 @@ class ESP32Camera:
 
         try:
             camera.conf(FRAMESIZE, size)
-            print(f"甯у昂瀵稿凡璁剧疆涓? {size}")
+            log(2, "framesize set: %s" % size)
             return True
         except Exception as e:
-            print(f"璁剧疆甯у昂瀵稿け璐? {e}")
+            log(1, "set framesize failed: %s" % e)
             return False
 
     def set_quality(self, quality):
@@ -169,10 +263,10 @@ class ESP32Camera:
 
         try:
             camera.conf(JPEG_QUALITY, max(1, min(31, quality)))
-            print(f"JPEG璐ㄩ噺宸茶缃负: {quality}")
+            log(2, "jpeg quality set: %s" % quality)
             return True
         except Exception as e:
-            print(f"璁剧疆JPEG璐ㄩ噺澶辫触: {e}")
+            log(1, "set quality failed: %s" % e)
             return False
 
     def set_contrast(self, contrast):
@@ -182,10 +276,10 @@ class ESP32Camera:
 
         try:
             camera.contrast(contrast)
-            print(f"瀵规瘮搴﹀凡璁剧疆涓? {contrast}")
+            log(2, "contrast set: %s" % contrast)
             return True
         except Exception as e:
-            print(f"璁剧疆瀵规瘮搴﹀け璐? {e}")
+            log(1, "set contrast failed: %s" % e)
             return False
 
     def get_status(self):
@@ -1,11 +1,157 @@
 """
 HTTP Server for ESP32-Cam
 HTTP服务器用于提供摄像头画面访问
+
+基于 asyncio：单核上多路复用多个客户端，
+一个 MJPEG 流不会再把其他请求（控制/状态）挡在门外
 """
 
-import socket
 import time
-from camera_setup import ESP32Camera, FRAMESIZE_VGA, FRAMESIZE_QVGA, FRAMESIZE_HD
+import gc
+import json
+import micropython
+import socket
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+from camera_setup import ESP32Camera, FRAMESIZE_VGA, FRAMESIZE_QVGA, FRAMESIZE_HD, log
+
+# MicroPython 有 sleep_ms；CPython 退化为 sleep(秒)
+_sleep_ms = getattr(asyncio, "sleep_ms", None)
+if _sleep_ms is None:
+    def _sleep_ms(ms):
+        return asyncio.sleep(ms / 1000)
+
+# 某些端口的 socket 模块不导出这两个常量，用标准值兜底
+_IPPROTO_TCP = getattr(socket, "IPPROTO_TCP", 6)
+_TCP_NODELAY = getattr(socket, "TCP_NODELAY", 1)
+_SOL_SOCKET = getattr(socket, "SOL_SOCKET", 0xFFF)
+_SO_SNDBUF = getattr(socket, "SO_SNDBUF", 0x1001)
+
+# MJPEG 目标帧周期（上限 ~10fps）。采集+发送本身耗时就占掉大半，
+# 只有真有富余时才补觉，不再固定睡 100ms 把帧率钉死
+FRAME_PERIOD_MS = 100
+
+# /control?size=... 支持的分辨率：加新档只改这张表
+SIZE_MAP = {
+    '640x480': FRAMESIZE_VGA,
+    '320x240': FRAMESIZE_QVGA,
+    '1280x720': FRAMESIZE_HD,
+}
+
+
+
+# 页面正文是编译期常量，放在模块级，__init__ 里一次性编码
+_HTML_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>ESP32 Camera</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <style>
+        body { font-family: Arial, sans-serif; text-align: center; margin: 0; padding: 20px; }
+        .container { max-width: 800px; margin: 0 auto; }
+        .camera-view { margin: 20px 0; }
+        img { max-width: 100%; border: 2px solid #333; }
+        .controls { margin: 20px 0; }
+        .btn { background: #007bff; color: white; border: none; padding: 10px 20px; margin: 5px; cursor: pointer; border-radius: 5px; }
+        .btn:hover { background: #0056b3; }
+        .status { background: #f8f9fa; padding: 10px; margin: 10px 0; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>ESP32-Camera 摄像头服务器</h1>
+
+        <div class="camera-view">
+            <h2>实时预览</h2>
+            <img src="/stream" alt="Camera Stream" id="cameraStream" onerror="this.src='/capture'">
+        </div>
+
+        <div class="controls">
+            <button class="btn" onclick="refreshImage()">刷新图片</button>
+            <button class="btn" onclick="showStatus()">查看状态</button>
+        </div>
+
+        <div class="status" id="status">
+            <strong>访问地址:</strong><br>
+            • 实时流: <a href="/stream">/stream</a><br>
+            • 单张图片: <a href="/capture">/capture</a><br>
+            • 状态信息: <a href="/status">/status</a>
+        </div>
+    </div>
+
+    <script>
+        function refreshImage() {
+            const img = document.getElementById('cameraStream');
+            img.src = '/capture?' + new Date().getTime();
+        }
+
+        function showStatus() {
+            fetch('/status')
+                .then(response => response.json())
+                .then(data => {
+                    alert('摄像头状态:\\n' + JSON.stringify(data, null, 2));
+                })
+                .catch(error => {
+                    alert('获取状态失败: ' + error);
+                });
+        }
+    </script>
+</body>
+</html>
+"""
+
+_NOT_FOUND_PAGE = """
+<!DOCTYPE html>
+<html>
+<head><title>404 Not Found</title></head>
+<body>
+    <h1>404 - 页面未找到</h1>
+    <p>请访问 <a href="/">首页</a> 或 <a href="/stream">实时流</a></p>
+</body>
+</html>
+"""
+
+# 完整响应（头+正文）在模块级一次性编码成 bytes：所有实例共享同一份，
+# 模块冻结成 .mpy 后只在 import 时构建一次。LwIP 没有 sendfile，
+# 把缓存 bytes 的 memoryview 直接交给 writer 就是这里的零拷贝等价物。
+# 注意 Content-Length 必须按编码后的字节数算，页面里有多字节中文
+_html_body = _HTML_PAGE.encode('utf-8')
+_HTML_RESP = (("HTTP/1.1 200 OK\r\n"
+               "Content-Type: text/html; charset=UTF-8\r\n"
+               "Cache-Control: no-cache\r\n"
+               "Content-Length: %d\r\n\r\n" % len(_html_body)).encode('ascii')
+              + _html_body)
+_nf_body = _NOT_FOUND_PAGE.encode('utf-8')
+_NOT_FOUND_RESP = (("HTTP/1.1 404 Not Found\r\n"
+                    "Content-Type: text/html; charset=UTF-8\r\n"
+                    "Content-Length: %d\r\n\r\n" % len(_nf_body)).encode('ascii')
+                   + _nf_body)
+del _html_body, _nf_body
+
+# 单张图片的响应头前缀，只差 Content-Length 数值
+_IMG_HDR = b'HTTP/1.1 200 OK\r\nContent-Type: image/jpeg\r\nCache-Control: no-cache\r\nContent-Length: '
+
+
+@micropython.native
+def _fill_envelope(buf, boundary_hdr, frame):
+    """把 边界头+JPEG+CRLF 拷进信封缓冲，返回有效长度。
+
+    纯字节搬运和整数运算，编译成原生码跳过字节码分发。
+    """
+    n = len(frame)
+    hdr = boundary_hdr + (b'%d' % n) + b'\r\n\r\n'
+    hl = len(hdr)
+    buf[:hl] = hdr
+    end = hl + n
+    buf[hl:end] = frame
+    buf[end:end + 2] = b'\r\n'
+    return end + 2
+
 
 class CameraHTTPServer:
     def __init__(self, camera, port=80):
@@ -18,7 +164,6 @@ class CameraHTTPServer:
         """
         self.camera = camera
         self.port = port
-        self.server_socket = None
         self.running = False
 
         # HTTP响应头
@@ -52,290 +197,318 @@ Access-Control-Allow-Origin: *""",
 Content-Type: text/html; charset=UTF-8""",
         }
 
-    def start_server(self):
-        """启动HTTP服务器"""
-        try:
-            # 创建socket
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-
-            # 绑定端口
-            addr = socket.getaddrinfo('0.0.0.0', self.port)[0][-1]
-            self.server_socket.bind(addr)
-            self.server_socket.listen(5)
-
-            self.running = True
-            print(f"HTTP服务器已启动，监听端口: {self.port}")
-            print(f"访问地址: http://192.168.4.1")
-
-            return True
-
-        except Exception as e:
-            print(f"启动HTTP服务器失败: {e}")
-            return False
+        self._mjpeg_hdr = (self.headers['mjpeg_stream'] + "\r\n\r\n").encode('utf-8')
+
+        # /status 里不变的部分以及 JSON 响应头提前备好
+        self._server_static = {"running": True, "port": self.port}
+        self._json_hdr = (self.headers['json_response'] + "\r\n").encode('utf-8')
+
+        # 采集扇出：单个生产者协程抓帧，所有流客户端共享同一帧，
+        # 观众数量增加时传感器带宽和 CPU 采集成本保持不变
+        self._latest_frame = None
+        self._frame_event = None
+        self._stream_clients = 0
+
+        # 路由表：一次哈希查找代替每个请求最多六次字符串比较
+        self._routes = {
+            '/': self.send_html_page,
+            '/index.html': self.send_html_page,
+            '/stream': self.send_mjpeg_stream,
+            '/live': self.send_mjpeg_stream,
+            '/capture': self.send_single_image,
+            '/photo.jpg': self.send_single_image,
+            '/status': self.send_status,
+        }
+        # /control 参数分发表：键 -> (设置函数, 值转换)
+        self._setters = {
+            'quality': (self.camera.set_quality, int),
+            'contrast': (self.camera.set_contrast, int),
+        }
 
     def stop_server(self):
         """停止HTTP服务器"""
         self.running = False
-        if self.server_socket:
-            try:
-                self.server_socket.close()
-                print("HTTP服务器已停止")
-            except:
-                pass
+        print("HTTP服务器已停止")
+
+    async def _send(self, writer, data):
+        """写出并等待排空，对端慢时让出事件循环"""
+        writer.write(data)
+        await writer.drain()
 
-    def handle_request(self, client_socket, client_address):
+    async def handle_request(self, reader, writer):
         """
-        处理客户端请求
+        处理客户端请求（asyncio 回调，每个连接一个任务）
 
         Args:
-            client_socket: 客户端socket
-            client_address: 客户端地址
+            reader: asyncio StreamReader
+            writer: asyncio StreamWriter
         """
+        # 关闭 Nagle：帧已经整包写出，再攒包只会平添几十毫秒延迟。
+        # 发送缓冲加大到 32KB，整帧 JPEG 一次进协议栈，
+        # drain 不用分多轮等小缓冲腾空（LwIP 不支持该选项时忽略）
         try:
-            # 接收请求
-            request = client_socket.recv(1024).decode('utf-8')
+            sock = writer.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(_IPPROTO_TCP, _TCP_NODELAY, 1)
+                try:
+                    sock.setsockopt(_SOL_SOCKET, _SO_SNDBUF, 32 * 1024)
+                except OSError:
+                    pass
+        except Exception:
+            pass
+
+        try:
+            # 接收请求：直接在 bytes 上解析请求行，
+            # 不做整包 UTF-8 解码，也不 split 出整个头部列表
+            request = await reader.read(1024)
             if not request:
                 return
 
-            print(f"收到来自 {client_address} 的请求")
-
-            # 解析请求路径
-            lines = request.split('\r\n')
-            if lines:
-                first_line = lines[0]
-                parts = first_line.split()
-                if len(parts) >= 2:
-                    method = parts[0]
-                    path = parts[1]
+            end = request.find(b'\r\n')
+            if end < 0:
+                return
+            parts = request[:end].split(b' ', 2)
+            if len(parts) >= 2:
+                # 只有路径需要变成 str 供路由表查找
+                path = parts[1].decode('ascii')
 
-                    # 路由处理
-                    if method == 'GET':
-                        self.handle_get_request(client_socket, path)
-                    else:
-                        self.send_404(client_socket)
+                # 路由处理
+                if parts[0] == b'GET':
+                    await self.handle_get_request(writer, path)
+                else:
+                    await self.send_404(writer)
 
         except Exception as e:
-            print(f"处理请求异常: {e}")
+            # 逐请求诊断走级别 2，默认不占 UART 时间
+            log(2, "处理请求异常: %s" % e)
         finally:
             try:
-                client_socket.close()
-            except:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
                 pass
 
-    def handle_get_request(self, client_socket, path):
-        """处理GET请求"""
+    async def handle_get_request(self, writer, path):
+        """处理GET请求（路由表分发）"""
         try:
-            if path == '/' or path == '/index.html':
-                self.send_html_page(client_socket)
-            elif path == '/stream' or path == '/live':
-                self.send_mjpeg_stream(client_socket)
-            elif path == '/capture' or path == '/photo.jpg':
-                self.send_single_image(client_socket)
-            elif path == '/status':
-                self.send_status(client_socket)
+            # /capture?169... 这类带时间戳的请求先剥掉查询串再查表
+            qs = path.find('?')
+            handler = self._routes.get(path if qs < 0 else path[:qs])
+            if handler:
+                await handler(writer)
             elif path.startswith('/control'):
-                self.handle_control(client_socket, path)
+                await self.handle_control(writer, path)
             else:
-                self.send_404(client_socket)
+                await self.send_404(writer)
 
         except Exception as e:
-            print(f"处理GET请求异常: {e}")
-            self.send_404(client_socket)
-
-    def send_html_page(self, client_socket):
-        """发送HTML页面"""
-        html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>ESP32 Camera</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        body { font-family: Arial, sans-serif; text-align: center; margin: 0; padding: 20px; }
-        .container { max-width: 800px; margin: 0 auto; }
-        .camera-view { margin: 20px 0; }
-        img { max-width: 100%; border: 2px solid #333; }
-        .controls { margin: 20px 0; }
-        .btn { background: #007bff; color: white; border: none; padding: 10px 20px; margin: 5px; cursor: pointer; border-radius: 5px; }
-        .btn:hover { background: #0056b3; }
-        .status { background: #f8f9fa; padding: 10px; margin: 10px 0; border-radius: 5px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>ESP32-Camera 摄像头服务器</h1>
-
-        <div class="camera-view">
-            <h2>实时预览</h2>
-            <img src="/stream" alt="Camera Stream" id="cameraStream" onerror="this.src='/capture'">
-        </div>
-
-        <div class="controls">
-            <button class="btn" onclick="refreshImage()">刷新图片</button>
-            <button class="btn" onclick="showStatus()">查看状态</button>
-        </div>
-
-        <div class="status" id="status">
-            <strong>访问地址:</strong><br>
-            • 实时流: <a href="/stream">/stream</a><br>
-            • 单张图片: <a href="/capture">/capture</a><br>
-            • 状态信息: <a href="/status">/status</a>
-        </div>
-    </div>
-
-    <script>
-        function refreshImage() {
-            const img = document.getElementById('cameraStream');
-            img.src = '/capture?' + new Date().getTime();
-        }
+            log(2, "处理GET请求异常: %s" % e)
+            await self.send_404(writer)
 
-        function showStatus() {
-            fetch('/status')
-                .then(response => response.json())
-                .then(data => {
-                    alert('摄像头状态:\\n' + JSON.stringify(data, null, 2));
-                })
-                .catch(error => {
-                    alert('获取状态失败: ' + error);
-                });
-        }
-    </script>
-</body>
-</html>
-"""
+    async def send_html_page(self, writer):
+        """发送HTML页面（模块级缓存，整包交给传输层）"""
+        await self._send(writer, memoryview(_HTML_RESP))
 
-        response = f"{self.headers['html_page']}\r\nContent-Length: {len(html_content)}\r\n\r\n{html_content}"
-        client_socket.send(response.encode('utf-8'))
+    async def _capture_loop(self):
+        """采集生产者：每周期抓一帧并广播给所有流订阅者"""
+        deadline = time.ticks_add(time.ticks_ms(), FRAME_PERIOD_MS)
+        while self.running:
+            if self._stream_clients:
+                frame = self.camera.capture_frame()
+                if frame:
+                    self._latest_frame = frame
+                    # 换新事件再唤醒旧事件的等待者：天然的逐帧广播，
+                    # 不需要 set/clear 的竞态处理
+                    ev = self._frame_event
+                    self._frame_event = asyncio.Event()
+                    ev.set()
+                # 按截止时间调度：只睡掉本周期剩余的时间，
+                # 采集慢于周期时立刻进入下一帧（仍让出一次事件循环）
+                wait = time.ticks_diff(deadline, time.ticks_ms())
+                await _sleep_ms(wait if wait > 0 else 0)
+                deadline = time.ticks_add(deadline, FRAME_PERIOD_MS)
+            else:
+                # 没有观众就不碰传感器
+                self._latest_frame = None
+                deadline = time.ticks_add(time.ticks_ms(), FRAME_PERIOD_MS)
+                await _sleep_ms(200)
 
-    def send_mjpeg_stream(self, client_socket):
-        """发送MJPEG流"""
+    async def send_mjpeg_stream(self, writer):
+        """发送MJPEG流（所有客户端共享 _capture_loop 的同一帧）"""
         try:
-            # 发送流媒体头
-            client_socket.send(f"{self.headers['mjpeg_stream']}\r\n\r\n".encode('utf-8'))
-
-            # 持续发送图像帧
-            boundary = b'--frame'
-            while self.running:
-                try:
-                    # 捕获图像
-                    frame = self.camera.capture_frame()
-                    if frame:
-                        # 发送帧头和图像数据
-                        frame_header = f"{boundary.decode()}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(frame)}\r\n\r\n"
-                        client_socket.send(frame_header.encode('utf-8'))
-                        client_socket.send(frame)
-                        client_socket.send(b'\r\n')
-                    else:
-                        # 如果捕获失败，发送空帧
-                        client_socket.send(b'--frame\r\nContent-Type: image/jpeg\r\n\r\n')
-                        client_socket.send(b'\r\n')
-
-                    time.sleep(0.1)  # 控制帧率
-
-                except Exception as e:
-                    print(f"发送流数据异常: {e}")
-                    break
+            # 发送流媒体头（__init__ 里已编码好）
+            await self._send(writer, self._mjpeg_hdr)
+
+            # 帧头+数据+结尾拷进本连接的信封缓冲一次写出；
+            # 信封按连接各留一份，避免 drain 让出期间互相覆写
+            boundary_hdr = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: '
+            buf = bytearray(64 * 1024 + 128)
+            frames = 0
+            self._stream_clients += 1
+            try:
+                while self.running:
+                    # 等生产者广播下一帧
+                    ev = self._frame_event
+                    await ev.wait()
+                    frame = self._latest_frame
+                    if not frame:
+                        continue
+
+                    # 发送期间禁用自动 GC：回收挪到帧边界做，
+                    # 避免 socket 写一半被标记-清扫打断造成卡顿
+                    gc.disable()
+                    try:
+                        end = _fill_envelope(buf, boundary_hdr, frame)
+                        writer.write(memoryview(buf)[:end])
+                    finally:
+                        gc.enable()
+                    # drain 期间事件循环可以去服务其他客户端
+                    await writer.drain()
+                    # 逐帧无条件 collect 太重：改为每 32 帧看一眼水位，
+                    # 只有真低于阈值才在帧边界回收（发送路径本身已不分配）
+                    frames += 1
+                    if frames & 31 == 0 and gc.mem_free() < 40000:
+                        gc.collect()
+            finally:
+                self._stream_clients -= 1
 
         except Exception as e:
-            print(f"MJPEG流异常: {e}")
+            # 客户端关闭页面就会走到这里，属正常路径
+            log(2, "MJPEG流异常: %s" % e)
 
-    def send_single_image(self, client_socket):
+    async def send_single_image(self, writer):
         """发送单张图片"""
         frame = self.camera.capture_frame()
         if frame:
-            response = f"{self.headers['single_image']}\r\nContent-Length: {len(frame)}\r\n\r\n"
-            client_socket.send(response.encode('utf-8'))
-            client_socket.send(frame)
+            # JPEG 用 memoryview 直接交给传输层，省一次整帧拷贝；
+            # 两次 write 同一轮 drain，仍然合批出网
+            writer.write(_IMG_HDR + str(len(frame)).encode() + b'\r\n\r\n')
+            writer.write(memoryview(frame))
+            await writer.drain()
         else:
-            self.send_404(client_socket)
+            await self.send_404(writer)
 
-    def send_status(self, client_socket):
+    async def send_status(self, writer):
         """发送状态信息"""
-        status_data = {
+        # 紧凑编码：浏览器自己会格式化，indent=2 的空白展开纯属浪费 CPU
+        json_bytes = json.dumps({
             "camera": self.camera.get_status(),
-            "server": {
-                "running": self.running,
-                "port": self.port
-            },
+            "server": self._server_static,
             "time": time.time()
-        }
+        }).encode('utf-8')
+        payload = (self._json_hdr
+                   + b'Content-Length: ' + str(len(json_bytes)).encode()
+                   + b'\r\n\r\n' + json_bytes)
+        await self._send(writer, payload)
 
-        import json
-        json_str = json.dumps(status_data, indent=2)
-        response = f"{self.headers['json_response']}\r\nContent-Length: {len(json_str)}\r\n\r\n{json_str}"
-        client_socket.send(response.encode('utf-8'))
-
-    def handle_control(self, client_socket, path):
+    async def handle_control(self, writer, path):
         """处理控制请求"""
         try:
             # 解析控制参数，例如: /control?size=640x480&quality=10
             if '?' in path:
                 params = path.split('?', 1)[1]
-                param_pairs = params.split('&')
-
-                for param in param_pairs:
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-
-                        if key == 'size' and value == '640x480':
-                            self.camera.set_framesize(FRAMESIZE_VGA)
-                        elif key == 'size' and value == '320x240':
-                            self.camera.set_framesize(FRAMESIZE_QVGA)
-                        elif key == 'quality':
-                            try:
-                                quality = int(value)
-                                self.camera.set_quality(quality)
-                            except:
-                                pass
-                        elif key == 'contrast':
-                            try:
-                                contrast = int(value)
-                                self.camera.set_contrast(contrast)
-                            except:
-                                pass
-
-                self.send_status(client_socket)
+                setters = self._setters
+
+                for param in params.split('&'):
+                    if '=' not in param:
+                        continue
+                    key, value = param.split('=', 1)
+
+                    setter = setters.get(key)
+                    if setter:
+                        fn, conv = setter
+                        try:
+                            fn(conv(value))
+                        except (ValueError, TypeError):
+                            pass
+                    elif key == 'size':
+                        fs = SIZE_MAP.get(value)
+                        if fs:
+                            self.camera.set_framesize(fs)
+
+                await self.send_status(writer)
             else:
-                self.send_404(client_socket)
+                await self.send_404(writer)
 
         except Exception as e:
-            print(f"控制请求处理异常: {e}")
-            self.send_404(client_socket)
+            log(2, "控制请求处理异常: %s" % e)
+            await self.send_404(writer)
 
-    def send_404(self, client_socket):
+    async def send_404(self, writer):
         """发送404错误"""
-        error_content = """
-<!DOCTYPE html>
-<html>
-<head><title>404 Not Found</title></head>
-<body>
-    <h1>404 - 页面未找到</h1>
-    <p>请访问 <a href="/">首页</a> 或 <a href="/stream">实时流</a></p>
-</body>
-</html>
-"""
-
-        response = f"{self.headers['not_found']}\r\nContent-Length: {len(error_content)}\r\n\r\n{error_content}"
-        client_socket.send(response.encode('utf-8'))
+        await self._send(writer, memoryview(_NOT_FOUND_RESP))
 
-    def run(self):
-        """运行服务器主循环"""
-        if not self.start_server():
-            return
+    async def udp_stream(self, port=8000, chunk=1350):
+        """UDP JPEG 分片推流：客户端先发任意数据报注册，然后持续收帧。
 
-        print("服务器正在运行，等待客户端连接...")
+        TCP 的重传和队头阻塞在丢包的 2.4G 链路上会拖垮帧率；
+        UDP 把帧切成 ~1350 字节的分片零拷贝发出，丢了就丢了，
+        新帧直接顶掉旧帧。/stream 的 MJPEG 路由保留作兜底。
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(socket.getaddrinfo('0.0.0.0', port)[0][-1])
+        sock.setblocking(False)
+        client = None
+        print(f"UDP流已就绪，端口: {port}（先发任意数据报注册）")
 
+        try:
+            while self.running:
+                # 随时接受新客户端/心跳，非阻塞
+                try:
+                    _, client = sock.recvfrom(16)
+                except OSError:
+                    pass
+
+                if client is None:
+                    await _sleep_ms(200)
+                    continue
+
+                frame = self.camera.capture_frame()
+                if frame:
+                    # memoryview 分片，发送过程零拷贝
+                    mv = memoryview(frame)
+                    n = len(mv)
+                    off = 0
+                    while off < n:
+                        try:
+                            sock.sendto(mv[off:off + chunk], client)
+                        except OSError:
+                            break
+                        off += chunk
+                # 帧间让出事件循环；下一轮直接取最新帧，旧帧自然被丢弃
+                await _sleep_ms(30)
+        finally:
+            sock.close()
+
+    async def serve(self):
+        """启动监听并保持事件循环运行"""
+        self.running = True
+        # backlog 默认只有 5：浏览器一页会并发开好几个连接（页面、流、
+        # 状态轮询），加上预加载很容易把 accept 队列挤爆导致拒连
+        server = await asyncio.start_server(self.handle_request, '0.0.0.0', self.port,
+                                            backlog=16)
+        self._frame_event = asyncio.Event()
+        asyncio.create_task(self._capture_loop())
+        asyncio.create_task(self.udp_stream())
+        print(f"HTTP服务器已启动，监听端口: {self.port}")
+        print(f"访问地址: http://192.168.4.1")
+
+        # 服务器由各连接任务驱动，这里只负责保活
         while self.running:
-            try:
-                # 等待客户端连接
-                client_socket, client_address = self.server_socket.accept()
-                print(f"客户端连接: {client_address}")
+            await asyncio.sleep(1)
 
-                # 处理请求
-                self.handle_request(client_socket, client_address)
+        try:
+            server.close()
+            await server.wait_closed()
+        except Exception:
+            pass
 
-            except Exception as e:
-                if self.running:  # 只在服务器运行时打印错误
-                    print(f"服务器运行异常: {e}")
-                time.sleep(0.1)
\ No newline at end of file
+    def run(self):
+        """运行服务器主循环"""
+        print("服务器正在运行，等待客户端连接...")
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.running = False
@@ -16,9 +16,34 @@ ESP32-Cam WiFi热点摄像头服务器
 import time
 import gc
 import machine
-from wifi_ap import WiFiAP
-from camera_setup import ESP32Camera
-from http_server import CameraHTTPServer
+# wifi_ap / camera_setup / http_server 延迟到 __init__ 里再导入：
+# MicroPython 的 import 要整段解析编译源码，启动即占 RAM，
+# 只 import 本模块取类定义时不必付这份开销
+
+# 启动横幅 / 访问信息：模块导入时拼好常量模板，
+# 运行时一次 % 格式化 + 一次 print，减少 UART 写事务和临时字符串
+_BANNER = "=" * 50
+_ACCESS_TMPL = """
+%s
+服务器已启动，可以通过以下方式访问:
+%s
+WiFi热点名称: %s
+WiFi密码: %s
+服务器IP: %s
+端口: %s
+
+访问地址:
+• 主页: http://%s/
+• 实时流: http://%s/stream
+• 单张图片: http://%s/capture
+• 状态信息: http://%s/status
+
+控制参数:
+• 设置分辨率: http://%s/control?size=640x480
+• 设置质量: http://%s/control?quality=10
+• 设置对比度: http://%s/control?contrast=1
+%s
+请连接WiFi热点并在浏览器中打开上述地址"""
 
 class ESP32CamServer:
     def __init__(self,
@@ -41,6 +66,12 @@ class ESP32CamServer:
         import esp
         esp.osdebug(None)
 
+        # 延迟导入重量级模块，并回收解析期的临时内存
+        from wifi_ap import WiFiAP
+        from camera_setup import ESP32Camera
+        from http_server import CameraHTTPServer
+        gc.collect()
+
         # 初始化组件
         self.wifi_ap = WiFiAP(wifi_ssid, wifi_password)
         self.camera = ESP32Camera()
@@ -57,8 +88,30 @@ class ESP32CamServer:
         machine.freq(240000000)  # 240MHz
         print(f"CPU频率设置为: {machine.freq()//1000000} MHz")
 
-        # 清理内存
+        # 关闭WiFi省电模式：省电时收发包会被攒批延迟，HTTP吞吐明显下降
+        try:
+            import network
+            pm_none = getattr(network.WLAN, "PM_NONE", 0xa11140)
+            network.WLAN(network.AP_IF).config(pm=pm_none)
+            print("WiFi省电模式已关闭")
+        except Exception as e:
+            print(f"关闭WiFi省电模式失败: {e}")
+
+        # 关闭蓝牙协议栈，释放RAM和2.4G时间片给WiFi
+        try:
+            import bluetooth
+            bluetooth.BLE().active(False)
+            print("蓝牙已关闭")
+        except Exception as e:
+            print(f"关闭蓝牙失败: {e}")
+
+        # 清理内存，并把 GC 阈值调高：让回收在可预期的时机成批发生，
+        # 而不是在请求处理中途被零散触发
         gc.collect()
+        try:
+            gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+        except AttributeError:
+            pass
         print(f"可用内存: {gc.mem_free()} bytes")
 
     def start(self):
@@ -104,24 +157,12 @@ class ESP32CamServer:
         ip = self.wifi_ap.get_ip()
         port = self.http_server.port
 
-        print("\n" + "=" * 50)
-        print("服务器已启动，可以通过以下方式访问:")
-        print("=" * 50)
-        print(f"WiFi热点名称: {self.wifi_ap.ssid}")
-        print(f"WiFi密码: {self.wifi_ap.password}")
-        print(f"服务器IP: {ip}")
-        print(f"端口: {port}")
-        print("\n访问地址:")
-        print(f"• 主页: http://{ip}/")
-        print(f"• 实时流: http://{ip}/stream")
-        print(f"• 单张图片: http://{ip}/capture")
-        print(f"• 状态信息: http://{ip}/status")
-        print("\n控制参数:")
-        print(f"• 设置分辨率: http://{ip}/control?size=640x480")
-        print(f"• 设置质量: http://{ip}/control?quality=10")
-        print(f"• 设置对比度: http://{ip}/control?contrast=1")
-        print("=" * 50)
-        print("请连接WiFi热点并在浏览器中打开上述地址")
+        print(_ACCESS_TMPL % (
+            _BANNER, _BANNER,
+            self.wifi_ap.ssid, self.wifi_ap.password, ip, port,
+            ip, ip, ip, ip, ip, ip, ip,
+            _BANNER,
+        ))
 
     def cleanup(self):
         """清理资源"""
@@ -181,6 +222,9 @@ def test_components():
     """测试各个组件"""
     print("测试ESP32摄像头组件...")
 
+    from wifi_ap import WiFiAP
+    from camera_setup import ESP32Camera
+
     # 测试WiFi热点
     print("\n1. 测试WiFi热点...")
     wifi = WiFiAP("Test-AP", "12345678")
@@ -3,6 +3,7 @@ ESP32-Cam 组件测试脚本
 测试WiFi、摄像头和HTTP服务器组件
 """
 
+import sys
 import time
 import gc
 
@@ -86,14 +87,17 @@ def test_memory():
         free_mem = gc.mem_free()
         alloc_mem = gc.mem_alloc()
 
-        print(f"可用内存: {free_mem} bytes ({free_mem//1024} KB)")
-        print(f"已用内存: {alloc_mem} bytes ({alloc_mem//1024} KB)")
-        print(f"总内存: {free_mem + alloc_mem} bytes ({(free_mem + alloc_mem)//1024} KB)")
-
+        # 攒成一段文本后一次写出，UART 上比逐行 print 少好几次刷新
+        lines = [
+            f"可用内存: {free_mem} bytes ({free_mem//1024} KB)",
+            f"已用内存: {alloc_mem} bytes ({alloc_mem//1024} KB)",
+            f"总内存: {free_mem + alloc_mem} bytes ({(free_mem + alloc_mem)//1024} KB)",
+        ]
         if free_mem < 50000:  # 少于50KB警告
-            print("⚠️  可用内存较少，建议重启设备")
+            lines.append("⚠️  可用内存较少，建议重启设备")
         else:
-            print("✅ 内存状态正常")
+            lines.append("✅ 内存状态正常")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return free_mem > 50000
 
@@ -114,20 +118,22 @@ def test_system_info():
 
         # CPU信息
         freq = machine.freq()
-        print(f"CPU频率: {freq//1000000} MHz")
+        lines = [f"CPU频率: {freq//1000000} MHz"]
 
         # Flash信息
         try:
             flash_size = esp.flash_size()
-            print(f"Flash大小: {flash_size//1024} KB")
+            lines.append(f"Flash大小: {flash_size//1024} KB")
         except:
-            print("Flash大小: 无法获取")
+            lines.append("Flash大小: 无法获取")
 
         # 系统信息
         uname = uos.uname()
-        print(f"系统: {uname.sysname}")
-        print(f"版本: {uname.version}")
-        print(f"机器: {uname.machine}")
+        lines.append(f"系统: {uname.sysname}")
+        lines.append(f"版本: {uname.version}")
+        lines.append(f"机器: {uname.machine}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return True
 
@@ -125,6 +125,11 @@ class ESP32Camera:
         self.frame_count = 0
         self.error_count = 0
 
+        # 帧缓冲复用: 驱动支持capture_into时DMA帧直接落进这块内存,
+        # 否则把capture()返回的bytes搬进来立即释放, 堆上不再逐帧留下~30KB拷贝
+        self._fb_buf = bytearray(64 * 1024)
+        self._capture_into = getattr(camera, "capture_into", None)
+
         print("[CAM] 鎽勫儚澶存ā鍧楀垵濮嬪寲")
         print(f"[CAM] 閰嶇疆淇℃伅:")
         print(f"[CAM]   甯у昂瀵? {FRAMESIZE_NAMES.get(self.config.get(FRAMESIZE), 'unknown')}")
@@ -217,7 +222,16 @@ class ESP32Camera:
 
         try:
             start_time = time.ticks_ms()
-            frame = camera.capture()
+            buf = self._fb_buf
+            if self._capture_into:
+                n = self._capture_into(buf)
+                frame = memoryview(buf)[:n] if n else None
+            else:
+                frame = camera.capture()
+                if frame and len(frame) <= len(buf):
+                    n = len(frame)
+                    buf[:n] = frame
+                    frame = memoryview(buf)[:n]
             elapsed = time.ticks_diff(time.ticks_ms(), start_time)
 
             if frame:
@@ -0,0 +1,65 @@
+"""
+HTML Assets for ESP32-Cam V2
+首页资源单独成模块: 加进冻结清单后整包bytes住在XIP flash里,
+http_server 只拿引用, 堆上不再留这几KB的页面拷贝
+"""
+
+_HTML_BODY = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>ESP32-Cam V2</title>
+<style>
+*{margin:0;padding:0;box-sizing:border-box}
+body{font-family:sans-serif;background:#1a1a2e;color:#eee;padding:20px}
+.container{max-width:800px;margin:0 auto}
+h1{text-align:center;color:#0df;margin:20px 0}
+.card{background:rgba(255,255,255,0.1);border-radius:10px;padding:15px;margin:10px 0}
+.camera-view{text-align:center}
+img{max-width:100%;border-radius:8px}
+.btn{background:#0df;color:#000;border:none;padding:10px 20px;border-radius:20px;cursor:pointer;margin:5px}
+.btn:hover{background:#09c}
+.status{display:grid;grid-template-columns:repeat(3,1fr);gap:10px;margin-top:10px}
+.status-item{background:rgba(0,0,0,0.3);padding:10px;border-radius:5px;text-align:center}
+.status-item label{color:#0df;font-size:11px}
+.status-item .value{font-size:16px;font-weight:bold;margin-top:5px}
+</style>
+</head>
+<body>
+<div class="container">
+<h1>ESP32-Cam V2</h1>
+<div class="card camera-view">
+<img src="/stream" id="cam" onerror="this.src='/capture'">
+<div style="margin-top:10px">
+<button class="btn" onclick="document.getElementById('cam').src='/stream?'+Date.now()">刷新流</button>
+<button class="btn" onclick="document.getElementById('cam').src='/capture?'+Date.now()">抓拍</button>
+<button class="btn" onclick="fetch('/status').then(r=>r.json()).then(d=>alert(JSON.stringify(d,null,2)))">状态</button>
+</div>
+</div>
+<div class="card">
+<div class="status">
+<div class="status-item"><label>内存</label><div class="value" id="mem">--</div></div>
+<div class="status-item"><label>帧数</label><div class="value" id="frames">--</div></div>
+<div class="status-item"><label>流</label><div class="value" id="streams">--</div></div>
+</div>
+</div>
+</div>
+<script>
+setInterval(()=>fetch('/status').then(r=>r.json()).then(d=>{
+if(d.memory)document.getElementById('mem').textContent=Math.round(d.memory.free/1024)+'KB';
+if(d.server){document.getElementById('frames').textContent=d.server.total_frames||0;document.getElementById('streams').textContent=d.server.active_streams||0}
+}).catch(()=>{}),3000);
+</script>
+</body>
+</html>""".encode('utf-8')
+
+_HTML_RESPONSE = (b"HTTP/1.1 200 OK\r\n"
+                  b"Content-Type: text/html; charset=UTF-8\r\n"
+                  b"Cache-Control: no-cache\r\n"
+                  b"Access-Control-Allow-Origin: *\r\n"
+                  b"Content-Length: %d\r\n\r\n" % len(_HTML_BODY)
+                  + _HTML_BODY)
+
+# 对外只暴露拼好的整包响应
+PAGE = _HTML_RESPONSE
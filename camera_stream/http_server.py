@@ -13,24 +13,56 @@ HTTP服务器模块 - 提供视频流和图像访问
 """
 
 import socket
+import select
 import time
 import gc
+import json
 import machine
+import micropython
 from camera_setup import (
     ESP32Camera,
     FRAMESIZE_VGA, FRAMESIZE_QVGA, FRAMESIZE_HD,
     FRAMESIZE_SVGA, FRAMESIZE_XGA
 )
+from html_assets import PAGE as _HTML_RESPONSE
+
+# 某些端口的 socket 模块不导出这两个常量，用 lwIP 的标准值兜底
+_IPPROTO_TCP = getattr(socket, "IPPROTO_TCP", 6)
+_TCP_NODELAY = getattr(socket, "TCP_NODELAY", 1)
+_SO_KEEPALIVE = getattr(socket, "SO_KEEPALIVE", 0x0008)
+_SO_SNDBUF = getattr(socket, "SO_SNDBUF", 0x1001)
+_SO_RCVBUF = getattr(socket, "SO_RCVBUF", 0x1002)
+# lwIP的keepalive调节选项编号 (秒/秒/次)。注意兜底值是lwIP的
+# 3/4/5, 不是Linux的4/5/6 —— ESP32端口的socket不导出这些名字,
+# 真正生效的永远是兜底值, 编号错一位会把空闲阈值写到间隔上
+_TCP_KEEPIDLE = getattr(socket, "TCP_KEEPIDLE", 3)
+_TCP_KEEPINTVL = getattr(socket, "TCP_KEEPINTVL", 4)
+_TCP_KEEPCNT = getattr(socket, "TCP_KEEPCNT", 5)
 
 # ==================== 内存管理配置 ====================
 GC_THRESHOLD = 80000        # 可用内存低于此值时触发GC (bytes)
-GC_INTERVAL = 50            # 每处理N个请求后强制GC
 STREAM_TIMEOUT = 120        # 流超时时间 (秒)
-STREAM_GC_INTERVAL = 30     # 流模式下每N帧执行一次GC
 LOW_MEMORY_WARNING = 40000  # 低内存告警阈值 (bytes)
 FRAME_DELAY = 0.08          # 帧间隔时间 (秒), 约12.5fps
 
 
+# /status 的骨架是固定的: 直接按模板用bytes %-格式化拼出来,
+# 不再逐请求构造嵌套dict再交给json.dumps走字节码遍历
+_STATUS_TMPL = (b'{"server":{"running":true,"port":%d,"uptime":%d,'
+                b'"request_count":%d,"client_count":%d,"active_streams":%d,'
+                b'"total_frames":%d,"gc_count":%d,"low_memory_count":%d},'
+                b'"memory":{"free":%d,"alloc":%d},'
+                b'"camera":%s,"wifi":%s}')
+
+
+# 单张图片响应头前缀, 只差Content-Length数值
+_IMG_HDR_PREFIX = (b"HTTP/1.1 200 OK\r\n"
+                   b"Content-Type: image/jpeg\r\n"
+                   b"Cache-Control: no-cache\r\n"
+                   b"Access-Control-Allow-Origin: *\r\n"
+                   b"Content-Length: ")
+
+
 def smart_gc(force=False, tag="[GC]"):
     """智能内存清理"""
     free_mem = gc.mem_free()
@@ -97,48 +129,112 @@ class CameraHTTPServer:
         print(f"[HTTP] 流超时: {STREAM_TIMEOUT} 秒")
         print(f"[HTTP] 帧间隔: {FRAME_DELAY*1000:.0f} ms")
 
-        # HTTP响应头模板 (预编码，减少运行时开销)
+        # HTTP响应头模板 (构造时就编码成bytes, 请求路径上零encode/零拼str)
         self.headers = {
             'mjpeg_stream': (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: multipart/x-mixed-replace; boundary=frame\r\n"
-                "Connection: keep-alive\r\n"
-                "Cache-Control: no-cache, no-store, max-age=0, must-revalidate\r\n"
-                "Pragma: no-cache\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: multipart/x-mixed-replace; boundary=frame\r\n"
+                b"Connection: keep-alive\r\n"
+                b"Cache-Control: no-cache, no-store, max-age=0, must-revalidate\r\n"
+                b"Pragma: no-cache\r\n"
+                b"Access-Control-Allow-Origin: *\r\n"
             ),
             'single_image': (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: image/jpeg\r\n"
-                "Cache-Control: no-cache\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: image/jpeg\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Access-Control-Allow-Origin: *\r\n"
             ),
             'html_page': (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=UTF-8\r\n"
-                "Cache-Control: no-cache\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/html; charset=UTF-8\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Access-Control-Allow-Origin: *\r\n"
             ),
             'json_response': (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json\r\n"
-                "Access-Control-Allow-Origin: *\r\n"
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Access-Control-Allow-Origin: *\r\n"
             ),
             'not_found': (
-                "HTTP/1.1 404 Not Found\r\n"
-                "Content-Type: text/html; charset=UTF-8\r\n"
+                b"HTTP/1.1 404 Not Found\r\n"
+                b"Content-Type: text/html; charset=UTF-8\r\n"
             ),
             'server_error': (
-                "HTTP/1.1 500 Internal Server Error\r\n"
-                "Content-Type: text/html; charset=UTF-8\r\n"
+                b"HTTP/1.1 500 Internal Server Error\r\n"
+                b"Content-Type: text/html; charset=UTF-8\r\n"
             ),
         }
+        # 流响应头整段备好, 建流时直接发
+        self._stream_hdr = self.headers['mjpeg_stream'] + b"\r\n"
+
+        # 摄像头/WiFi状态片段的序列化缓存 (变化慢, 没必要逐请求dumps)
+        self._aux_json = (b'null', b'null')
+        self._aux_expire = 0
+
+        # 请求读缓冲: readinto复用同一块512字节, 请求路径零分配
+        self._req_buf = bytearray(512)
+        self._req_len = 0
 
         # 预编码边界标记
         self.boundary_frame = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: '
         self.boundary_end = b'\r\n\r\n'
         self.frame_end = b'\r\n'
 
+        # 流帧发送缓冲: 边界头+JPEG+结尾拼进同一块预分配内存一次sendall,
+        # 每帧3次socket调用(3个TCP段)降为1次
+        self._tx_buf = bytearray(64 * 1024 + 128)
+
+        # 帧头缓冲: 固定前缀只拷一次, 每帧只把长度数字和空行写进去,
+        # 不再为 str(len(frame)).encode() 和头部拼接逐帧分配
+        self._hdr_buf = bytearray(96)
+        self._hdr_buf[:len(self.boundary_frame)] = self.boundary_frame
+        self._hdr_prefix_len = len(self.boundary_frame)
+
+    @micropython.native
+    def _format_hdr(self, n):
+        """把Content-Length的十进制数字+空行写进帧头缓冲, 返回头部总长"""
+        buf = self._hdr_buf
+        i = self._hdr_prefix_len
+        if n == 0:
+            buf[i] = 0x30
+            i += 1
+        else:
+            start = i
+            while n:
+                buf[i] = 0x30 + n % 10
+                n //= 10
+                i += 1
+            # 数字是倒着写的, 原地翻转
+            lo = start
+            hi = i - 1
+            while lo < hi:
+                buf[lo], buf[hi] = buf[hi], buf[lo]
+                lo += 1
+                hi -= 1
+        buf[i:i + 4] = b'\r\n\r\n'
+        return i + 4
+
+    @staticmethod
+    @micropython.native
+    def _send_nb(sock, poller, mv):
+        """非阻塞发送整块数据, 对端慢时用poll等待可写
+
+        write返回None(EAGAIN)或部分字节数时继续推进;
+        1秒都腾不出发送缓冲就当死连接抛OSError, 让上层断流。
+        """
+        off = 0
+        n = len(mv)
+        # 个别端口的socket没有write, 退回send (非阻塞语义一致: 返回已写字节数)
+        write = getattr(sock, "write", None) or sock.send
+        while off < n:
+            if not poller.poll(1000):
+                raise OSError("send stalled")
+            w = write(mv[off:])
+            if w:
+                off += w
+        return n
+
     def start_server(self):
         """启动HTTP服务器"""
         print("\n" + "=" * 50)
@@ -152,7 +248,11 @@ class CameraHTTPServer:
             # 创建socket
             self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.settimeout(1.0)
+            try:
+                # 关闭Nagle: MJPEG是纯延迟敏感负载, 攒包只会增加40-200ms抖动
+                self.server_socket.setsockopt(_IPPROTO_TCP, _TCP_NODELAY, 1)
+            except OSError:
+                pass
 
             # 绑定端口
             addr = socket.getaddrinfo('0.0.0.0', self.port)[0][-1]
@@ -188,28 +288,26 @@ class CameraHTTPServer:
 
         try:
             client_socket.settimeout(5.0)
-            request_data = client_socket.recv(512)  # 减小缓冲区
+            buf = self._req_buf
+            n = client_socket.readinto(buf)  # 复用缓冲, 不再逐请求recv出新bytes
 
-            if not request_data:
+            if not n:
                 return
-
-            try:
-                request = request_data.decode('utf-8')
-            except:
-                request = request_data.decode('latin-1')
-
-            # 解析请求
-            lines = request.split('\r\n')
-            if lines:
-                parts = lines[0].split()
-                if len(parts) >= 2:
-                    method, path = parts[0], parts[1]
-                    print(f"[HTTP] {method} {path}")
-
-                    if method == 'GET':
-                        self.handle_get_request(client_socket, path, request_id)
-                    else:
-                        self.send_404(client_socket)
+            self._req_len = n  # 供send_status在原缓冲里找If-None-Match
+
+            # 直接在bytes上解析请求行: 不整包decode成str,
+            # 也不split出整个头部列表 (每请求省一次512字节str+一串小str)
+            sp1 = buf.find(b' ', 0, n)
+            sp2 = buf.find(b' ', sp1 + 1, n)
+            if sp1 > 0 and sp2 > sp1:
+                # 只有path需要独立出来 (后面当dict键/切片用)
+                path = bytes(buf[sp1 + 1:sp2])
+                print("[HTTP] %s %s" % (buf[:sp1].decode(), path.decode()))
+
+                if buf.startswith(b'GET '):
+                    self.handle_get_request(client_socket, path, request_id)
+                else:
+                    self.send_404(client_socket)
 
         except socket.timeout:
             print(f"[HTTP] 请求 #{request_id} 超时")
@@ -221,83 +319,27 @@ class CameraHTTPServer:
             except:
                 pass
 
-            # 定期内存清理
-            if self.request_count % GC_INTERVAL == 0:
-                cleaned, _ = smart_gc(tag=f"[HTTP] 定期清理(请求#{self.request_count})")
-                if cleaned:
-                    self.gc_count += 1
-
+    @micropython.native
     def handle_get_request(self, client_socket, path, request_id):
-        """处理GET请求"""
-        if path in ('/', '/index.html'):
+        """处理GET请求 (path为bytes, 比较零解码)"""
+        if path in (b'/', b'/index.html'):
             self.send_html_page(client_socket)
-        elif path in ('/stream', '/live', '/video'):
+        elif path in (b'/stream', b'/live', b'/video'):
             self.send_mjpeg_stream(client_socket, request_id)
-        elif path in ('/capture', '/photo.jpg', '/image'):
+        elif path in (b'/capture', b'/photo.jpg', b'/image'):
             self.send_single_image(client_socket)
-        elif path in ('/status', '/info'):
+        elif path in (b'/status', b'/info'):
             self.send_status(client_socket)
-        elif path.startswith('/control'):
+        elif path.startswith(b'/control'):
             self.handle_control(client_socket, path)
-        elif path == '/favicon.ico':
+        elif path == b'/favicon.ico':
             self.send_404(client_socket)
         else:
             self.send_404(client_socket)
 
     def send_html_page(self, client_socket):
-        """发送HTML页面"""
-        html = """<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width,initial-scale=1">
-<title>ESP32-Cam V2</title>
-<style>
-*{margin:0;padding:0;box-sizing:border-box}
-body{font-family:sans-serif;background:#1a1a2e;color:#eee;padding:20px}
-.container{max-width:800px;margin:0 auto}
-h1{text-align:center;color:#0df;margin:20px 0}
-.card{background:rgba(255,255,255,0.1);border-radius:10px;padding:15px;margin:10px 0}
-.camera-view{text-align:center}
-img{max-width:100%;border-radius:8px}
-.btn{background:#0df;color:#000;border:none;padding:10px 20px;border-radius:20px;cursor:pointer;margin:5px}
-.btn:hover{background:#09c}
-.status{display:grid;grid-template-columns:repeat(3,1fr);gap:10px;margin-top:10px}
-.status-item{background:rgba(0,0,0,0.3);padding:10px;border-radius:5px;text-align:center}
-.status-item label{color:#0df;font-size:11px}
-.status-item .value{font-size:16px;font-weight:bold;margin-top:5px}
-</style>
-</head>
-<body>
-<div class="container">
-<h1>ESP32-Cam V2</h1>
-<div class="card camera-view">
-<img src="/stream" id="cam" onerror="this.src='/capture'">
-<div style="margin-top:10px">
-<button class="btn" onclick="document.getElementById('cam').src='/stream?'+Date.now()">刷新流</button>
-<button class="btn" onclick="document.getElementById('cam').src='/capture?'+Date.now()">抓拍</button>
-<button class="btn" onclick="fetch('/status').then(r=>r.json()).then(d=>alert(JSON.stringify(d,null,2)))">状态</button>
-</div>
-</div>
-<div class="card">
-<div class="status">
-<div class="status-item"><label>内存</label><div class="value" id="mem">--</div></div>
-<div class="status-item"><label>帧数</label><div class="value" id="frames">--</div></div>
-<div class="status-item"><label>流</label><div class="value" id="streams">--</div></div>
-</div>
-</div>
-</div>
-<script>
-setInterval(()=>fetch('/status').then(r=>r.json()).then(d=>{
-if(d.memory)document.getElementById('mem').textContent=Math.round(d.memory.free/1024)+'KB';
-if(d.server){document.getElementById('frames').textContent=d.server.total_frames||0;document.getElementById('streams').textContent=d.server.active_streams||0}
-}).catch(()=>{}),3000);
-</script>
-</body>
-</html>"""
-
-        response = self.headers['html_page'] + f"Content-Length: {len(html)}\r\n\r\n{html}"
-        client_socket.sendall(response.encode('utf-8'))
+        """发送HTML页面 (模块级整包响应, 零格式化零分配)"""
+        client_socket.sendall(_HTML_RESPONSE)
 
     def send_mjpeg_stream(self, client_socket, request_id):
         """发送MJPEG流 (优化版)"""
@@ -305,53 +347,93 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
 
         self.active_streams += 1
         frame_count = 0
-        stream_start = time.time()
-        last_gc_frame = 0
+        # ticks_ms是纯整数运算; time.time()的浮点每帧都得新分配
+        stream_start = time.ticks_ms()
         consecutive_errors = 0
+        # 小帧聚合: 重量化的JPEG不足一个MSS时攒最多~1400字节/30ms再发,
+        # 由我们而不是Nagle决定包边界 (NODELAY已开)
+        acc = 0
+        last_flush = stream_start
+
+        # 热循环里用到的名字先绑成局部变量:
+        # MicroPython的全局/属性查找都是O(dict), 每帧好几次很可观
+        _ticks = time.ticks_ms
+        _diff = time.ticks_diff
+        _sleep = time.sleep
+        _capture = self.camera.capture_frame
+        _send = self._send_nb
+        _fmt = self._format_hdr
+        _mem = gc.mem_free
+        hdr_buf = self._hdr_buf
+        frame_end = self.frame_end
         MAX_ERRORS = 5  # 连续错误上限
 
         try:
-            # 发送流头
-            client_socket.sendall((self.headers['mjpeg_stream'] + "\r\n").encode('utf-8'))
+            # 流socket切到非阻塞: 捕获节奏不再被慢客户端的sendall绑死,
+            # 客户端跟不上就丢帧 (MJPEG本来就是有损的)
+            client_socket.setblocking(False)
+            poller = select.poll()
+            poller.register(client_socket, select.POLLOUT)
 
-            # 设置socket超时
-            client_socket.settimeout(5.0)
+            # 发送流头
+            self._send_nb(client_socket, poller, self._stream_hdr)
 
             while self.running:
                 # 检查超时
-                if time.time() - stream_start > STREAM_TIMEOUT:
+                if _diff(_ticks(), stream_start) > STREAM_TIMEOUT * 1000:
                     print(f"[HTTP] 流 #{request_id} 超时断开")
                     break
 
-                # 检查内存
-                mem_status = check_memory()
-                if mem_status["warning"]:
+                # 内存回收交给 gc.threshold (setup_system 里设定):
+                # 这里只保留每100帧一次的应急水位检查
+                if frame_count % 100 == 0 and _mem() < LOW_MEMORY_WARNING:
                     self.low_memory_count += 1
                     smart_gc(force=True, tag=f"[HTTP] 流#{request_id} 低内存")
 
                 try:
+                    # 发送缓冲还没腾出来就跳过本帧, 等20ms再看
+                    if not poller.poll(20):
+                        continue
+
                     # 捕获帧
-                    frame = self.camera.capture_frame()
+                    frame = _capture()
 
                     if frame:
                         consecutive_errors = 0  # 重置错误计数
                         frame_count += 1
                         self.total_frames_sent += 1
 
-                        # 发送帧 (优化: 减少拼接操作)
-                        frame_len = str(len(frame)).encode()
-                        client_socket.sendall(self.boundary_frame + frame_len + self.boundary_end)
-                        client_socket.sendall(frame)
-                        client_socket.sendall(self.frame_end)
-
-                        # 每30帧清理内存
-                        if frame_count - last_gc_frame >= STREAM_GC_INTERVAL:
-                            smart_gc(force=True, tag=f"[HTTP] 流#{request_id} 帧清理")
-                            last_gc_frame = frame_count
+                        # 发送帧 (优化: 整帧拼进预分配缓冲, 一次发出网)
+                        n = len(frame)
+                        hl = _fmt(n)
+                        env = hl + n + 2
+                        tx = self._tx_buf
+                        if acc + env <= len(tx):
+                            tx[acc:acc + hl] = memoryview(hdr_buf)[:hl]
+                            tx[acc + hl:acc + hl + n] = frame
+                            tx[acc + hl + n:acc + env] = frame_end
+                            acc += env
+                            if (acc < 1400
+                                    and _diff(_ticks(), last_flush) < 30):
+                                # 还装得进一个MSS且30ms没到, 继续攒下一帧
+                                pass
+                            else:
+                                _send(client_socket, poller, memoryview(tx)[:acc])
+                                acc = 0
+                                last_flush = _ticks()
+                        else:
+                            # 超大帧不常见, 先清掉积攒再退回三次发送
+                            if acc:
+                                _send(client_socket, poller, memoryview(tx)[:acc])
+                                acc = 0
+                            _send(client_socket, poller, memoryview(hdr_buf)[:hl])
+                            _send(client_socket, poller, memoryview(frame))
+                            _send(client_socket, poller, frame_end)
+                            last_flush = _ticks()
 
                         # 每50帧打印状态
                         if frame_count % 50 == 0:
-                            elapsed = time.time() - stream_start
+                            elapsed = _diff(_ticks(), stream_start) / 1000
                             fps = frame_count / elapsed if elapsed > 0 else 0
                             print(f"[HTTP] 流#{request_id}: {frame_count}帧, {fps:.1f}fps, 内存:{gc.mem_free()}")
 
@@ -363,11 +445,11 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
                             print(f"[HTTP] 流#{request_id}: 连续错误过多，断开")
                             break
 
-                        time.sleep(0.1)
+                        _sleep(0.1)
                         continue
 
                     # 帧间隔控制
-                    time.sleep(FRAME_DELAY)
+                    _sleep(FRAME_DELAY)
 
                 except socket.timeout:
                     print(f"[HTTP] 流#{request_id}: Socket超时")
@@ -386,7 +468,7 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
             print(f"[HTTP] 流#{request_id}: 异常 ({e})")
         finally:
             self.active_streams -= 1
-            elapsed = time.time() - stream_start
+            elapsed = time.ticks_diff(time.ticks_ms(), stream_start) / 1000
             avg_fps = frame_count / elapsed if elapsed > 0 else 0
             print(f"[HTTP] 流#{request_id} 结束: {frame_count}帧, {elapsed:.0f}秒, {avg_fps:.1f}fps")
 
@@ -397,64 +479,67 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
         """发送单张图片"""
         frame = self.camera.capture_frame()
         if frame:
-            header = self.headers['single_image'] + f"Content-Length: {len(frame)}\r\n\r\n"
-            client_socket.sendall(header.encode('utf-8'))
+            # 头是固定前缀+长度数字; JPEG本身是memoryview, 两次发送零拷贝
+            client_socket.sendall(_IMG_HDR_PREFIX + b"%d\r\n\r\n" % len(frame))
             client_socket.sendall(frame)
             print(f"[HTTP] 图片已发送 ({len(frame)} bytes)")
         else:
             self.send_500(client_socket, "Capture failed")
 
     def send_status(self, client_socket):
-        """发送状态信息"""
-        mem_status = check_memory()
-
-        status = {
-            "camera": self.camera.get_status(),
-            "server": {
-                "running": self.running,
-                "port": self.port,
-                "uptime": round(time.time() - self.start_time, 1),
-                "request_count": self.request_count,
-                "client_count": self.client_count,
-                "active_streams": self.active_streams,
-                "total_frames": self.total_frames_sent,
-                "gc_count": self.gc_count,
-                "low_memory_count": self.low_memory_count
-            },
-            "wifi": self.wifi_sta.get_status() if self.wifi_sta else None,
-            "memory": mem_status
-        }
+        """发送状态信息 (固定骨架手拼, 慢变片段带5秒缓存, 支持ETag/304)"""
+        # 弱校验标签: 这几个计数没变, 状态就没有值得重发的内容。
+        # 页面每3秒轮询一次, 空闲时命中304只回~60字节, 不再序列化JSON
+        etag = b'"%d-%d-%d"' % (self.total_frames_sent, self.active_streams,
+                                self.gc_count)
+        if self._req_buf.find(etag, 0, self._req_len) >= 0:
+            client_socket.sendall(b"HTTP/1.1 304 Not Modified\r\nETag: "
+                                  + etag + b"\r\n\r\n")
+            return
 
-        import json
-        json_str = json.dumps(status)
-        response = self.headers['json_response'] + f"Content-Length: {len(json_str)}\r\n\r\n{json_str}"
-        client_socket.sendall(response.encode('utf-8'))
+        now = time.time()
+        if now > self._aux_expire:
+            cam = json.dumps(self.camera.get_status()).encode('utf-8')
+            wifi = (json.dumps(self.wifi_sta.get_status()).encode('utf-8')
+                    if self.wifi_sta else b'null')
+            self._aux_json = (cam, wifi)
+            self._aux_expire = now + 5
+
+        cam_b, wifi_b = self._aux_json
+        body = _STATUS_TMPL % (self.port, int(now - self.start_time),
+                               self.request_count, self.client_count,
+                               self.active_streams, self.total_frames_sent,
+                               self.gc_count, self.low_memory_count,
+                               gc.mem_free(), gc.mem_alloc(),
+                               cam_b, wifi_b)
+        client_socket.sendall(self.headers['json_response']
+                              + b"ETag: " + etag
+                              + b"\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
 
     def handle_control(self, client_socket, path):
-        """处理控制请求"""
-        if '?' not in path:
+        """处理控制请求 (path为bytes)"""
+        if b'?' not in path:
             help_data = {"usage": "/control?size=640x480&quality=10", "sizes": ["320x240", "640x480", "800x600"], "quality": "1-31"}
-            import json
-            json_str = json.dumps(help_data)
-            response = self.headers['json_response'] + f"Content-Length: {len(json_str)}\r\n\r\n{json_str}"
-            client_socket.sendall(response.encode('utf-8'))
+            body = json.dumps(help_data).encode('utf-8')
+            client_socket.sendall(self.headers['json_response']
+                                  + b"Content-Length: %d\r\n\r\n" % len(body) + body)
             return
 
         params = {}
-        for param in path.split('?', 1)[1].split('&'):
-            if '=' in param:
-                k, v = param.split('=', 1)
+        for param in path.split(b'?', 1)[1].split(b'&'):
+            if b'=' in param:
+                k, v = param.split(b'=', 1)
                 params[k] = v
 
-        print(f"[HTTP] 控制: {params}")
+        print("[HTTP] 控制: %s" % params)
 
-        if 'size' in params:
-            size_map = {'320x240': FRAMESIZE_QVGA, '640x480': FRAMESIZE_VGA, '800x600': FRAMESIZE_SVGA, '1280x720': FRAMESIZE_HD}
-            if params['size'] in size_map:
-                self.camera.set_framesize(size_map[params['size']])
+        if b'size' in params:
+            size_map = {b'320x240': FRAMESIZE_QVGA, b'640x480': FRAMESIZE_VGA, b'800x600': FRAMESIZE_SVGA, b'1280x720': FRAMESIZE_HD}
+            if params[b'size'] in size_map:
+                self.camera.set_framesize(size_map[params[b'size']])
 
-        for p, setter in [('quality', self.camera.set_quality), ('contrast', self.camera.set_contrast),
-                          ('brightness', self.camera.set_brightness), ('saturation', self.camera.set_saturation)]:
+        for p, setter in [(b'quality', self.camera.set_quality), (b'contrast', self.camera.set_contrast),
+                          (b'brightness', self.camera.set_brightness), (b'saturation', self.camera.set_saturation)]:
             if p in params:
                 try:
                     setter(int(params[p]))
@@ -465,15 +550,15 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
 
     def send_404(self, client_socket):
         """发送404错误"""
-        html = "<html><body><h1>404</h1><a href='/'>Home</a></body></html>"
-        response = self.headers['not_found'] + f"Content-Length: {len(html)}\r\n\r\n{html}"
-        client_socket.sendall(response.encode('utf-8'))
+        body = b"<html><body><h1>404</h1><a href='/'>Home</a></body></html>"
+        client_socket.sendall(self.headers['not_found']
+                              + b"Content-Length: %d\r\n\r\n" % len(body) + body)
 
     def send_500(self, client_socket, msg="Error"):
         """发送500错误"""
-        html = f"<html><body><h1>500</h1><p>{msg}</p></body></html>"
-        response = self.headers['server_error'] + f"Content-Length: {len(html)}\r\n\r\n{html}"
-        client_socket.sendall(response.encode('utf-8'))
+        body = ("<html><body><h1>500</h1><p>%s</p></body></html>" % msg).encode('utf-8')
+        client_socket.sendall(self.headers['server_error']
+                              + b"Content-Length: %d\r\n\r\n" % len(body) + body)
 
     def run(self):
         """运行服务器主循环"""
@@ -484,20 +569,49 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
         print("[HTTP] 服务器运行中...")
         print("=" * 50)
 
-        last_status_time = time.time()
+        last_status_time = time.ticks_ms()
         STATUS_INTERVAL = 60  # 每60秒打印一次状态
 
+        # 用poll等新连接: 不再靠settimeout(1.0)每秒空醒一次,
+        # 空闲时lwIP只在真有连接(或60秒状态周期到)时唤醒CPU,
+        # WiFi省电模式也才有机会生效
+        poller = select.poll()
+        poller.register(self.server_socket, select.POLLIN)
+
         while self.running:
             try:
                 try:
-                    client_socket, client_address = self.server_socket.accept()
-                    self.client_count += 1
-                    self.handle_request(client_socket, client_address)
+                    if poller.poll(STATUS_INTERVAL * 1000):
+                        client_socket, client_address = self.server_socket.accept()
+                        try:
+                            # 每个连接都要设置: accept出的socket不一定继承监听socket的选项
+                            client_socket.setsockopt(_IPPROTO_TCP, _TCP_NODELAY, 1)
+                        except OSError:
+                            pass
+                        try:
+                            # lwIP默认发送缓冲(~5.7KB)装不下一帧JPEG, 每帧要
+                            # 多轮write+等待; 放大到32KB让整帧一次进协议栈。
+                            # 收方向只读512字节请求, 1KB就够, 省点RAM
+                            client_socket.setsockopt(socket.SOL_SOCKET, _SO_SNDBUF, 32768)
+                            client_socket.setsockopt(socket.SOL_SOCKET, _SO_RCVBUF, 1024)
+                        except OSError:
+                            pass
+                        try:
+                            # keepalive让lwIP在协议栈里收割静默死掉的观众
+                            # (浏览器断电/离开WiFi时不会发FIN),
+                            # ~30秒内send报OSError, 不用等两分钟流超时
+                            client_socket.setsockopt(socket.SOL_SOCKET, _SO_KEEPALIVE, 1)
+                            client_socket.setsockopt(_IPPROTO_TCP, _TCP_KEEPIDLE, 15)
+                            client_socket.setsockopt(_IPPROTO_TCP, _TCP_KEEPINTVL, 5)
+                            client_socket.setsockopt(_IPPROTO_TCP, _TCP_KEEPCNT, 3)
+                        except OSError:
+                            pass
+                        self.client_count += 1
+                        self.handle_request(client_socket, client_address)
 
-                except socket.timeout:
                     # 定期状态打印和内存检查
-                    now = time.time()
-                    if now - last_status_time > STATUS_INTERVAL:
+                    now = time.ticks_ms()
+                    if time.ticks_diff(now, last_status_time) > STATUS_INTERVAL * 1000:
                         mem = check_memory()
                         print(f"[HTTP] 状态: 请求={self.request_count}, 流={self.active_streams}, "
                               f"帧={self.total_frames_sent}, 内存={mem['free']}({mem['free_percent']:.0f}%)")
@@ -508,7 +622,6 @@ if(d.server){document.getElementById('frames').textContent=d.server.total_frames
                             smart_gc(force=True, tag="[HTTP] 定期清理")
                             self.gc_count += 1
 
-                    continue
                 except OSError:
                     continue
 
@@ -91,6 +91,12 @@ class ESP32CamV2Server:
 
         # 清理内存
         gc.collect()
+        try:
+            # 按"自上次回收以来新分配的字节数"触发GC (MicroPython PR #2247
+            # 的策略): 回收跟着分配速率走, 流循环里不再需要逐帧检查
+            gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+        except AttributeError:
+            pass
         print(f"[MAIN] 可用内存: {gc.mem_free()} bytes")
         print(f"[MAIN] 已分配内存: {gc.mem_alloc()} bytes")
 
@@ -10,11 +10,61 @@ WiFi客户端模式 - 连接到现有WiFi网络
 """
 
 import network
+import socket
 import time
 import gc
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+# 状态码常量提到模块级 (个别固件不导出, 用ESP32标准值兜底)
+_STAT_GOT_IP = getattr(network, "STAT_GOT_IP", 5)
+_STAT_CONNECTING = getattr(network, "STAT_CONNECTING", 1)
+_STAT_NO_AP_FOUND = getattr(network, "STAT_NO_AP_FOUND", 3)
+_STAT_WRONG_PASSWORD = getattr(network, "STAT_WRONG_PASSWORD", 2)
+_STAT_CONNECT_FAIL = getattr(network, "STAT_CONNECT_FAIL", 4)
+
+# 小型DNS解析缓存: 同一主机反复getaddrinfo, 每次都是一个20~200ms的
+# UDP往返; 缓存8条、60秒过期, 重复连接同一服务器时直接命中
+_dns_cache = {}
+
+def gai(host, port):
+    """socket.getaddrinfo 的缓存包装 (8条LRU, 60秒TTL)"""
+    key = (host, port)
+    v = _dns_cache.get(key)
+    now = time.time()
+    if v and now - v[1] < 60:
+        return v[0]
+    res = socket.getaddrinfo(host, port)
+    _dns_cache[key] = (res, now)
+    if len(_dns_cache) > 8:
+        # 淘汰最早插入的一条 (MicroPython字典保持插入序)
+        _dns_cache.pop(next(iter(_dns_cache)))
+    return res
+
+# WLAN句柄是驱动单例的外观, 但每次network.WLAN()都要进一次IDF;
+# 模块级各取一次, 之后全部复用
+_STA = network.WLAN(network.STA_IF)
+_AP = network.WLAN(network.AP_IF)
+
+# 状态码含义表放模块级: 每次连接失败都现场建一个8项字典只为查一次,
+# 在 ~100KB 堆上是纯浪费, 还会加重失败重试期间的GC压力
+_STATUS_MEANINGS = {
+    0: "STAT_IDLE - 空闲状态",
+    1: "STAT_NO_AP_FOUND - 未找到AP",
+    2: "STAT_WRONG_PASSWORD - 密码错误",
+    3: "STAT_NO_AP_FOUND_IN_RSSI - 信号太弱",
+    4: "STAT_CONNECT_FAIL - 连接失败",
+    5: "STAT_GOT_IP - 已获取IP (连接成功)",
+    1000: "STAT_ASSOC - 正在关联",
+    1001: "STAT_HANDSHAKE_TIMEOUT - 握手超时",
+}
+
 class WiFiStation:
-    def __init__(self, ssid, password, timeout=30, retry_count=3):
+    def __init__(self, ssid, password, timeout=30, retry_count=3, debug_scan=False,
+                 verbose=False):
         """
         初始化WiFi Station
 
@@ -23,119 +73,181 @@ class WiFiStation:
             password: WiFi密码
             timeout: 连接超时时间(秒)
             retry_count: 重试次数
+            debug_scan: 连接前是否扫描并打印周边网络(调试用)
+            verbose: 是否输出过程性日志 (115200波特率下每行print约2ms
+                     的同步UART写, 一次连接十几行能占掉~50ms; 错误和
+                     失败原因不受此开关影响, 始终输出)
         """
         self.ssid = ssid
         self.password = password
         self.timeout = timeout
         self.retry_count = retry_count
-        self.sta = None
+        self.debug_scan = debug_scan
+        self.verbose = verbose
+
+        # 压掉IDF的wifi:系列info日志: 重连期间它们在主线程阻塞时
+        # 还占着UART发送, 看起来就像死循环
+        try:
+            import esp
+            esp.osdebug(None)
+        except Exception:
+            pass
+        self.sta = _STA
         self.ip_address = None
         self.connected = False
+        # ifconfig结果缓存: 连接期间地址不会变, 不必每次状态查询都进驱动
+        self._ifcfg = None
 
-        print(f"[WIFI] WiFi Station 模块初始化")
-        print(f"[WIFI] 目标SSID: {ssid}")
-        print(f"[WIFI] 连接超时: {timeout}秒")
-        print(f"[WIFI] 重试次数: {retry_count}")
+        if verbose:
+            print(f"[WIFI] WiFi Station 模块初始化")
+            print(f"[WIFI] 目标SSID: {ssid}")
+            print(f"[WIFI] 连接超时: {timeout}秒")
+            print(f"[WIFI] 重试次数: {retry_count}")
 
     def connect(self):
         """
-        连接到WiFi网络
+        连接到WiFi网络 (阻塞版, 内部跑connect_async)
 
         Returns:
             bool: 连接是否成功
         """
-        print("\n" + "=" * 50)
-        print("[WIFI] 开始连接WiFi网络...")
-        print("=" * 50)
+        return asyncio.run(self.connect_async())
+
+    async def connect_async(self):
+        """
+        连接到WiFi网络 (协程版)
+
+        等待窗口全部换成 await sleep: 10秒量级的连网期间事件循环
+        可以继续跑传感器/看门狗等其他协程, 系统调用序列不变
+
+        Returns:
+            bool: 连接是否成功
+        """
+        verbose = self.verbose
+        if verbose:
+            print("\n" + "=" * 50)
+            print("[WIFI] 开始连接WiFi网络...")
+            print("=" * 50)
 
         # 关闭AP模式
         try:
-            ap = network.WLAN(network.AP_IF)
-            if ap.active():
-                ap.active(False)
-                print("[WIFI] AP模式已关闭")
+            if _AP.active():
+                _AP.active(False)
+                if verbose:
+                    print("[WIFI] AP模式已关闭")
         except Exception as e:
             print(f"[WIFI] 关闭AP模式失败: {e}")
 
-        # 创建STA接口
-        try:
-            self.sta = network.WLAN(network.STA_IF)
+        if verbose:
             print(f"[WIFI] STA接口状态: {'已激活' if self.sta.active() else '未激活'}")
-        except Exception as e:
-            print(f"[WIFI] 创建STA接口失败: {e}")
-            return False
 
         # 如果已连接，先断开
         if self.sta.isconnected():
-            print("[WIFI] 检测到已有连接，先断开...")
+            if verbose:
+                print("[WIFI] 检测到已有连接，先断开...")
             self.sta.disconnect()
-            time.sleep(1)
+            await asyncio.sleep_ms(1000)
 
         # 激活STA接口
-        print("[WIFI] 激活STA接口...")
+        if verbose:
+            print("[WIFI] 激活STA接口...")
         self.sta.active(True)
-        time.sleep(0.5)
+        await asyncio.sleep_ms(500)
 
-        # 扫描网络（可选，用于调试）
-        print("[WIFI] 扫描可用网络...")
-        try:
-            networks = self.sta.scan()
-            print(f"[WIFI] 发现 {len(networks)} 个网络:")
-            for i, net in enumerate(networks[:10]):  # 只显示前10个
-                ssid_bytes, bssid, channel, rssi, authmode, hidden = net
-                ssid_str = ssid_bytes.decode('utf-8') if ssid_bytes else '<hidden>'
-                print(f"[WIFI]   {i+1}. {ssid_str} (信道:{channel}, 信号:{rssi}dBm)")
-        except Exception as e:
-            print(f"[WIFI] 扫描网络失败: {e}")
+        # 扫描网络（仅调试时开启: scan()会同步阻塞WiFi任务1.5~4秒,
+        # 结果只用来打印, 默认跳过, 直奔connect省下这段感知延迟）
+        if self.debug_scan:
+            print("[WIFI] 扫描可用网络...")
+            try:
+                networks = self.sta.scan()
+                print(f"[WIFI] 发现 {len(networks)} 个网络:")
+                for i, net in enumerate(networks[:10]):  # 只显示前10个
+                    ssid_bytes, bssid, channel, rssi, authmode, hidden = net
+                    ssid_str = ssid_bytes.decode('utf-8') if ssid_bytes else '<hidden>'
+                    print(f"[WIFI]   {i+1}. {ssid_str} (信道:{channel}, 信号:{rssi}dBm)")
+            except Exception as e:
+                print(f"[WIFI] 扫描网络失败: {e}")
 
         # 尝试连接
         for attempt in range(1, self.retry_count + 1):
-            print(f"\n[WIFI] === 连接尝试 {attempt}/{self.retry_count} ===")
+            if verbose:
+                print(f"\n[WIFI] === 连接尝试 {attempt}/{self.retry_count} ===")
 
             try:
                 # 清理内存
                 gc.collect()
 
+                # 上一轮还卡在CONNECTING时直接叠加connect()会塞满IDF的
+                # WiFi任务队列, 实测能把调用方阻塞10~60秒; 先断开再重发
+                if self.sta.status() == _STAT_CONNECTING:
+                    self.sta.disconnect()
+                    await asyncio.sleep_ms(200)
+
+                # 关掉IDF自动重连: 否则驱动在底下自己补发connect,
+                # 和这里的重试循环打架, 失败原因也被它刷掉
+                try:
+                    self.sta.config(reconnects=0)
+                except Exception:
+                    pass
+
                 # 开始连接
-                print(f"[WIFI] 正在连接到: {self.ssid}")
+                if verbose:
+                    print(f"[WIFI] 正在连接到: {self.ssid}")
                 self.sta.connect(self.ssid, self.password)
 
-                # 等待连接
-                start_time = time.time()
-                while time.time() - start_time < self.timeout:
-                    if self.sta.isconnected():
+                # 等待连接: 状态码驱动, 100ms一查 —
+                # 关联完成后最多100ms就返回, 不再整秒整秒地睡;
+                # 密码错/找不到AP这类确定性失败立即止损, 不傻等超时
+                start = time.ticks_ms()
+                deadline = self.timeout * 1000
+                status = None
+                while time.ticks_diff(time.ticks_ms(), start) < deadline:
+                    status = self.sta.status()
+                    if status == _STAT_GOT_IP or self.sta.isconnected():
                         # 连接成功
                         self.connected = True
-                        self.ip_address = self.sta.ifconfig()[0]
+                        self._ifcfg = self.sta.ifconfig()
+                        self.ip_address = self._ifcfg[0]
 
-                        print("\n" + "=" * 50)
-                        print("[WIFI] WiFi 连接成功!")
-                        print("=" * 50)
-                        self._print_connection_info()
+                        # 连上之后把掉线自愈交还给驱动
+                        try:
+                            self.sta.config(reconnects=self.retry_count)
+                        except Exception:
+                            pass
 
-                        return True
+                        if verbose:
+                            print("\n" + "=" * 50)
+                            print("[WIFI] WiFi 连接成功!")
+                            print("=" * 50)
+                            self._print_connection_info()
 
-                    # 显示等待状态
-                    elapsed = time.time() - start_time
-                    print(f"[WIFI] 等待连接中... ({elapsed:.1f}秒)")
-                    time.sleep(1)
+                        return True
 
-                # 连接超时
-                print(f"[WIFI] 连接超时 ({self.timeout}秒)")
+                    if status in (_STAT_NO_AP_FOUND, _STAT_WRONG_PASSWORD,
+                                  _STAT_CONNECT_FAIL):
+                        break
+                    await asyncio.sleep_ms(100)
+                else:
+                    # 超时走到这里
+                    print(f"[WIFI] 连接超时 ({self.timeout}秒)")
 
                 # 显示失败原因
-                status = self.sta.status()
                 print(f"[WIFI] 连接状态码: {status}")
                 self._print_status_meaning(status)
 
+                # 密码错误重试也不会变对, 直接放弃
+                if status == _STAT_WRONG_PASSWORD:
+                    break
+
             except Exception as e:
                 print(f"[WIFI] 连接过程异常: {e}")
 
-            # 等待后重试
+            # 指数退避后重试 (2 -> 4 -> 8秒): 给驱动留出清理时间,
+            # 也避免在差信号环境里无间隔地轰炸AP
             if attempt < self.retry_count:
-                wait_time = 2
+                wait_time = 2 << (attempt - 1)
                 print(f"[WIFI] 等待 {wait_time}秒后重试...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
 
         # 所有尝试都失败
         print("\n" + "=" * 50)
@@ -148,10 +260,10 @@ class WiFiStation:
 
     def _print_connection_info(self):
         """打印连接详细信息"""
-        if not self.sta or not self.sta.isconnected():
+        if not self.sta.isconnected():
             return
 
-        ifconfig = self.sta.ifconfig()
+        ifconfig = self._ifcfg or self.sta.ifconfig()
         print(f"[WIFI] IP地址: {ifconfig[0]}")
         print(f"[WIFI] 子网掩码: {ifconfig[1]}")
         print(f"[WIFI] 网关: {ifconfig[2]}")
@@ -166,58 +278,54 @@ class WiFiStation:
 
     def _print_status_meaning(self, status):
         """打印状态码含义"""
-        status_meanings = {
-            0: "STAT_IDLE - 空闲状态",
-            1: "STAT_NO_AP_FOUND - 未找到AP",
-            2: "STAT_WRONG_PASSWORD - 密码错误",
-            3: "STAT_NO_AP_FOUND_IN_RSSI - 信号太弱",
-            4: "STAT_CONNECT_FAIL - 连接失败",
-            5: "STAT_GOT_IP - 已获取IP (连接成功)",
-            1000: "STAT_ASSOC - 正在关联",
-            1001: "STAT_HANDSHAKE_TIMEOUT - 握手超时",
-        }
-        meaning = status_meanings.get(status, f"未知状态")
-        print(f"[WIFI] 状态含义: {meaning}")
+        print(f"[WIFI] 状态含义: {_STATUS_MEANINGS.get(status, '未知状态')}")
 
     def disconnect(self):
         """断开WiFi连接"""
-        print("[WIFI] 断开WiFi连接...")
+        if self.verbose:
+            print("[WIFI] 断开WiFi连接...")
         if self.sta:
             try:
                 self.sta.disconnect()
                 self.connected = False
                 self.ip_address = None
-                print("[WIFI] WiFi已断开")
+                self._ifcfg = None
+                if self.verbose:
+                    print("[WIFI] WiFi已断开")
             except Exception as e:
                 print(f"[WIFI] 断开连接失败: {e}")
 
     def is_connected(self):
         """检查是否已连接"""
-        if self.sta:
-            self.connected = self.sta.isconnected()
-        return self.connected
+        connected = self.sta.isconnected()
+        if not connected:
+            self._ifcfg = None  # 掉线后地址作废
+        self.connected = connected
+        return connected
 
     def get_ip(self):
-        """获取IP地址"""
-        if self.sta and self.sta.isconnected():
-            self.ip_address = self.sta.ifconfig()[0]
+        """获取IP地址 (优先走缓存)"""
+        if self._ifcfg:
+            return self._ifcfg[0]
+        if self.sta.isconnected():
+            self._ifcfg = self.sta.ifconfig()
+            self.ip_address = self._ifcfg[0]
         return self.ip_address
 
     def get_status(self):
         """获取连接状态"""
-        if not self.sta:
-            return {"connected": False, "error": "STA接口未初始化"}
-
+        connected = self.is_connected()
         return {
-            "connected": self.sta.isconnected(),
+            "connected": connected,
             "ip": self.get_ip(),
             "ssid": self.ssid,
-            "ifconfig": self.sta.ifconfig() if self.sta.isconnected() else None
+            "ifconfig": self._ifcfg
         }
 
     def reconnect(self):
         """重新连接WiFi"""
-        print("[WIFI] 尝试重新连接...")
+        if self.verbose:
+            print("[WIFI] 尝试重新连接...")
         self.disconnect()
         time.sleep(1)
         return self.connect()
@@ -232,12 +340,10 @@ class WiFiStation:
         Returns:
             bool: 当前是否连接
         """
-        if not self.sta:
-            return False
-
         if not self.sta.isconnected():
             print("[WIFI] 检测到连接断开!")
             self.connected = False
+            self._ifcfg = None
             return False
 
         return True
@@ -253,7 +359,7 @@ def test_wifi_connection():
     print("WiFi连接测试")
     print("=" * 50)
 
-    wifi = WiFiStation(test_ssid, test_password, timeout=20, retry_count=2)
+    wifi = WiFiStation(test_ssid, test_password, timeout=20, retry_count=2, verbose=True)
 
     if wifi.connect():
         print("\n测试成功!")
@@ -261,10 +367,10 @@ def test_wifi_connection():
         # 测试网络连通性
         print("\n测试网络连通性...")
         try:
-            import socket
+            addr = gai("8.8.8.8", 53)[0][-1]
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(5)
-            result = sock.connect_ex(("8.8.8.8", 53))
+            result = sock.connect_ex(addr)
             sock.close()
 
             if result == 0:
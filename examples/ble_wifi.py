@@ -1,5 +1,6 @@
 import network
 import time
+import _thread
 import bluetooth
 from bluetooth import BLE
 
@@ -76,6 +77,11 @@ current_conn_handle = None
 wifi_cached = {"ssid": None, "pwd": None}
 pending_wifi_config = {"ssid": None, "pwd": None}
 
+# 配网事件锁：主循环阻塞在 acquire 上睡觉，BLE 中断收齐配置后 release 唤醒。
+# 不再每 100ms 空转轮询字典，CPU 可以交给无线协处理层
+_wifi_evt = _thread.allocate_lock()
+_wifi_evt.acquire()
+
 
 def send_ble_message(msg):
     """向手机发送 BLE 通知"""
@@ -144,6 +150,9 @@ def bt_irq(event, data):
                     pending_wifi_config["pwd"]  = wifi_cached["pwd"]
                     send_ble_message("CFG_OK")
                     print("➡ WiFi 配置收齐，准备连接")
+                    # 唤醒主循环（重复配网时锁可能已经是开的）
+                    if _wifi_evt.locked():
+                        _wifi_evt.release()
 
             else:
                 send_ble_message("ERR_FORMAT")
@@ -155,22 +164,23 @@ advertise()
 print("系统启动完毕：BLE 配网模式")
 
 
-# ========== 主循环：处理 WiFi 连接 ==========
+# ========== 主循环：处理 WiFi 连接（事件驱动，平时睡在锁上） ==========
 while True:
-    if pending_wifi_config["ssid"] and pending_wifi_config["pwd"]:
-        ssid = pending_wifi_config["ssid"]
-        pwd  = pending_wifi_config["pwd"]
+    _wifi_evt.acquire()  # 阻塞到 BLE 中断送来一套完整配置
 
-        pending_wifi_config["ssid"] = None
-        pending_wifi_config["pwd"]  = None
+    ssid = pending_wifi_config["ssid"]
+    pwd  = pending_wifi_config["pwd"]
+    if not (ssid and pwd):
+        continue
 
-        send_ble_message("WIFI_CONNECTING")
-        ok, info = connect_wifi(ssid, pwd)
+    pending_wifi_config["ssid"] = None
+    pending_wifi_config["pwd"]  = None
 
-        if ok:
-            ip, mask, gw, dns = info
-            send_ble_message("WIFI_OK," + ip)
-        else:
-            send_ble_message("WIFI_FAIL")
+    send_ble_message("WIFI_CONNECTING")
+    ok, info = connect_wifi(ssid, pwd)
 
-    time.sleep(0.1)
+    if ok:
+        ip, mask, gw, dns = info
+        send_ble_message("WIFI_OK," + ip)
+    else:
+        send_ble_message("WIFI_FAIL")
@@ -6,7 +6,9 @@ import time
 import random
 import neopixel
 import math
+import micropython
 import _thread
+from array import array
 from machine import Pin, PWM
 from tm1637 import TM1637
 from base.log import debug, info, warn   # 使用 base/log.py 的 d/i/w
@@ -43,13 +45,19 @@ _last_rgb_ms    = 0
 # 功能函数（在线程中执行）
 # ======================
 
+# 音量包络一次算好：循环里不再做 range 步进的整数装箱，
+# 只是顺序扫一段现成的无符号短整型数组
+_RAMP = array('H', range(512, 0, -5))
+
 def buzzer_3sec():
     info("BUZZ", "蜂鸣器开始响 3 秒")
     try:
         buzzer_pwm = PWM(buzzer_pin, freq=1000, duty=512)
-        for duty in range(512, 0, -5):
-            buzzer_pwm.duty(duty)
-            time.sleep_ms(50)
+        _duty = buzzer_pwm.duty
+        _sleep = time.sleep_ms
+        for d in _RAMP:
+            _duty(d)
+            _sleep(50)
         buzzer_pwm.deinit()
     except Exception as e:
         warn("BUZZ", "执行异常: %r" % e)
@@ -57,15 +65,26 @@ def buzzer_3sec():
         buzzer_pin.off()
         info("BUZZ", "蜂鸣器结束")
 
+# 2*pi/1000 预先算好：循环里只剩一次乘法，不再每步重算 t*2*pi
+_TWO_PI_OVER_1000 = 2 * math.pi / 1000
+
+@micropython.native
+def _breath_loop(duty, start):
+    # 热循环编译成原生码并把全局量绑成局部，省掉每步的字典查找和字节码分发
+    _sin = math.sin
+    _ticks = time.ticks_ms
+    _diff = time.ticks_diff
+    _sleep = time.sleep_ms
+    k = _TWO_PI_OVER_1000
+    while _diff(_ticks(), start) < 3000:
+        # (sin+1)*511.5 落在 0..1023，& 0x3FF 兜底代替 max/min 夹取
+        duty(int((_sin(_ticks() * k) + 1.0) * 511.5) & 0x3FF)
+        _sleep(10)
+
 def breathing_3sec():
     info("PWM", "呼吸灯开始 3 秒")
-    start = time.ticks_ms()
     try:
-        while time.ticks_diff(time.ticks_ms(), start) < 3000:
-            t = time.ticks_ms() / 1000
-            duty = int(512 + 512 * math.sin(t * 2 * math.pi))
-            pwm_led.duty(max(0, min(1023, duty)))
-            time.sleep_ms(10)
+        _breath_loop(pwm_led.duty, time.ticks_ms())
     except Exception as e:
         warn("PWM", "执行异常: %r" % e)
     finally:
@@ -93,14 +112,45 @@ def rgb_random_3times():
 # 中断回调（IRQ -> 起线程）
 # ======================
 
-# 忙碌标志，防止重复起线程
+# 忙碌标志，防止同一动作重复入队
 _flag_buzzer = False
 _flag_pwm    = False
 _flag_rgb    = False
 
+# 单工作线程 + 锁守护的任务槽：每次按键起新线程要 ~2KB 栈 + GIL 抢占，
+# 连按时还会耗尽 pystack。改成导入时预起一个线程，平时睡在锁上，
+# 投递任务只是"填槽 + 放锁"，内存占用恒定
+_job_slot = None
+_job_lock = _thread.allocate_lock()
+_job_lock.acquire()
+
+def _worker():
+    global _job_slot, _flag_buzzer, _flag_pwm, _flag_rgb
+    while True:
+        _job_lock.acquire()
+        job = _job_slot
+        _job_slot = None
+        if job is None:
+            continue
+        flag_name, target = job
+        try:
+            target()
+        except Exception as e:
+            warn("THREAD", "%s 任务异常: %r" % (flag_name, e))
+        finally:
+            if flag_name == "buzzer":
+                _flag_buzzer = False
+            elif flag_name == "pwm":
+                _flag_pwm = False
+            elif flag_name == "rgb":
+                _flag_rgb = False
+            debug("THREAD", "%s 任务结束，标志位已清零" % flag_name)
+
+_thread.start_new_thread(_worker, ())
+
 def _start_thread_safe(flag_name, target):
-    """根据标志位安全启动新线程"""
-    global _flag_buzzer, _flag_pwm, _flag_rgb
+    """把任务投进工作线程（动作进行中或槽被占用时丢弃本次触发）"""
+    global _flag_buzzer, _flag_pwm, _flag_rgb, _job_slot
 
     if flag_name == "buzzer":
         if _flag_buzzer:
@@ -115,30 +165,34 @@ def _start_thread_safe(flag_name, target):
             return
         _flag_rgb = True
 
-    def wrapper():
-        try:
-            target()
-        finally:
-            global _flag_buzzer, _flag_pwm, _flag_rgb
-            if flag_name == "buzzer":
-                _flag_buzzer = False
-            elif flag_name == "pwm":
-                _flag_pwm = False
-            elif flag_name == "rgb":
-                _flag_rgb = False
-            debug("THREAD", "%s 线程结束，标志位已清零" % flag_name)
-
-    try:
-        _thread.start_new_thread(wrapper, ())
-        debug("THREAD", "启动 %s 线程" % flag_name)
-    except Exception as e:
-        warn("THREAD", "启动 %s 线程失败: %r" % (flag_name, e))
+    if _job_slot is not None:
+        # 槽里已有待执行任务（工作线程正忙），丢弃本次按键
         if flag_name == "buzzer":
             _flag_buzzer = False
         elif flag_name == "pwm":
             _flag_pwm = False
         elif flag_name == "rgb":
             _flag_rgb = False
+        return
+
+    _job_slot = (flag_name, target)
+    if _job_lock.locked():
+        _job_lock.release()
+    debug("THREAD", "投递 %s 任务" % flag_name)
+
+# ISR 里禁止堆分配：日志格式化和任务投递都搬到 micropython.schedule
+# 的回调里在主线程跑，中断里只留一次 ticks 去抖比较（~5us）
+def _do_buzzer(_):
+    debug("IRQ", "蜂鸣器按键触发")
+    _start_thread_safe("buzzer", buzzer_3sec)
+
+def _do_pwm(_):
+    debug("IRQ", "呼吸灯按键触发")
+    _start_thread_safe("pwm", breathing_3sec)
+
+def _do_rgb(_):
+    debug("IRQ", "RGB 按键触发")
+    _start_thread_safe("rgb", rgb_random_3times)
 
 def buzzer_irq(pin):
     global _last_buzzer_ms
@@ -146,8 +200,10 @@ def buzzer_irq(pin):
     if time.ticks_diff(now, _last_buzzer_ms) < BTN_DEBOUNCE_MS:
         return
     _last_buzzer_ms = now
-    debug("IRQ", "蜂鸣器按键触发")
-    _start_thread_safe("buzzer", buzzer_3sec)
+    try:
+        micropython.schedule(_do_buzzer, 0)
+    except RuntimeError:
+        pass  # 调度队列满，丢弃本次按键
 
 def pwm_irq(pin):
     global _last_pwm_ms
@@ -155,8 +211,10 @@ def pwm_irq(pin):
     if time.ticks_diff(now, _last_pwm_ms) < BTN_DEBOUNCE_MS:
         return
     _last_pwm_ms = now
-    debug("IRQ", "呼吸灯按键触发")
-    _start_thread_safe("pwm", breathing_3sec)
+    try:
+        micropython.schedule(_do_pwm, 0)
+    except RuntimeError:
+        pass
 
 def rgb_irq(pin):
     global _last_rgb_ms
@@ -164,13 +222,20 @@ def rgb_irq(pin):
     if time.ticks_diff(now, _last_rgb_ms) < BTN_DEBOUNCE_MS:
         return
     _last_rgb_ms = now
-    debug("IRQ", "RGB 按键触发")
-    _start_thread_safe("rgb", rgb_random_3times)
+    try:
+        micropython.schedule(_do_rgb, 0)
+    except RuntimeError:
+        pass
+
+def led_edge_irq(pin):
+    # 双沿中断直接跟随按键电平（按下=0 -> 点亮），主循环不再逐圈轮询
+    led_pin.value(pin.value() ^ 1)
 
 # 绑定中断
 btn_buzzer.irq(trigger=Pin.IRQ_FALLING, handler=buzzer_irq)
 btn_pwm.irq(trigger=Pin.IRQ_FALLING, handler=pwm_irq)
 btn_rgb.irq(trigger=Pin.IRQ_FALLING, handler=rgb_irq)
+btn_led.irq(trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, handler=led_edge_irq)
 
 # ======================
 # 初始化状态
@@ -186,40 +251,34 @@ info("MAIN", "按键：LED=%d, BUZZER=%d, PWM=%d, RGB=%d" %
      (BTN_LED_PIN, BTN_BUZZER_PIN, BTN_PWM_PIN, BTN_RGB_PIN))
 
 # ======================
-# 主循环：LED 轮询 + 数码管递增 + 心跳日志
+# 主循环：数码管限频刷新 + 心跳日志（LED 已交给中断）
 # ======================
 
 def run():
     n = 0
-    last_led_state = btn_led.value()
-    last_hb = time.ticks_ms()
+    last_tm = time.ticks_ms()
+    last_hb = last_tm
 
     while True:
-        # LED 按键轮询控制（按下点亮，松开熄灭）
-        curr_led_state = btn_led.value()
-        if curr_led_state != last_led_state:
-            if curr_led_state == 0:
-                led_pin.on()
-                debug("MAIN", "LED 点亮")
-            else:
-                led_pin.off()
-                debug("MAIN", "LED 熄灭")
-            last_led_state = curr_led_state
-
-        # 数码管递增显示（0~9999）
-        tm.number(n)
-        n = (n + 1) % 10000
+        now = time.ticks_ms()
+
+        # 数码管递增显示（0~9999）。TM1637 是 ~100us/bit 的位脚本总线，
+        # 整屏写一次要 ~4ms 且期间关中断——只在数字真要变的节拍刷一次，
+        # 250ms 一跳肉眼完全跟得上
+        if time.ticks_diff(now, last_tm) >= 250:
+            last_tm = now
+            tm.number(n)
+            n = (n + 1) % 10000
 
         # 每秒打印一次心跳
-        now = time.ticks_ms()
         if time.ticks_diff(now, last_hb) >= 1000:
             last_hb = now
             msg = "n=%d buzzer_busy=%d pwm_busy=%d rgb_busy=%d led_btn=%d" % (
-                n, _flag_buzzer, _flag_pwm, _flag_rgb, curr_led_state
+                n, _flag_buzzer, _flag_pwm, _flag_rgb, btn_led.value()
             )
             info("HB", msg)
 
-        time.sleep_ms(100)
+        time.sleep_ms(50)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,11 @@ from machine import Pin
 import time
 from base.log import debug, info, warn
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
 # ======================
 # 配置模块
 # ======================
@@ -31,14 +36,25 @@ def pir_changed(new_state):
         info("PIR", "人体离开，恢复静止 (LOW)")
 
 # ======================
-# 主循环：监控 PIR 状态
+# 事件驱动监控：引脚边沿中断 -> ThreadSafeFlag 唤醒
+# 原来的循环每 50ms 醒一次只为读一个 GPIO，空闲时纯烧 CPU，
+# 响应还要最多等一个轮询周期；改成 IRQ 置旗、协程睡在旗上，
+# 空闲占用归零，状态变化亚毫秒级到达
 # ======================
-def run():
+_flag = asyncio.ThreadSafeFlag()
+
+def _pir_isr(pin):
+    # ISR 里只置旗，判抖和日志都留在主循环
+    _flag.set()
+
+async def _monitor():
     global _last_ms, _last_state
 
     info("PIR", "开始监控人体感应数据...")
+    pir.irq(trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=_pir_isr)
 
     while True:
+        await _flag.wait()
         now = time.ticks_ms()
         state = pir.value()
 
@@ -52,7 +68,8 @@ def run():
 
             _last_ms = now
 
-        time.sleep_ms(50)
+def run():
+    asyncio.run(_monitor())
 
 # ======================
 # 运行本文件时自动启动
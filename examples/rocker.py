@@ -1,5 +1,6 @@
 # 摇杆
 import time
+from array import array
 from machine import Pin, ADC
 
 # 初始化模拟输入引脚
@@ -16,6 +17,12 @@ vry.atten(ADC.ATTN_0DB)  # 0-3.3V输入范围
 # 设置阈值，只有超过此值才认为发生了摇动
 THRESHOLD = 50
 
+# ESP32 的 SAR ADC 噪声不小，单次采样很容易抖过阈值误报。
+# 每轴用一个 4 格的 array('H') 环形缓冲，每 tick 采 4 次取均值（移位代替除法），
+# 噪声约降 4 倍，且缓冲只在导入时分配一次，循环里零堆分配。
+_vrx_buf = array('H', (0, 0, 0, 0))
+_vry_buf = array('H', (0, 0, 0, 0))
+
 # 存储之前的模拟值
 last_vrx_value = -1
 last_vry_value = -1
@@ -24,9 +31,12 @@ def run():
     global last_vrx_value, last_vry_value
     # 持续读取模拟值
     while True:
-        # 获取水平方向（VRX）和垂直方向（VRY）的值
-        vrx_value = vrx.read()  # 读取VRX的模拟值（0 - 4095）
-        vry_value = vry.read()  # 读取VRY的模拟值（0 - 4095）
+        # 获取水平方向（VRX）和垂直方向（VRY）的值：各采 4 次求均值去噪
+        for i in range(4):
+            _vrx_buf[i] = vrx.read()  # 读取VRX的模拟值（0 - 4095）
+            _vry_buf[i] = vry.read()  # 读取VRY的模拟值（0 - 4095）
+        vrx_value = (_vrx_buf[0] + _vrx_buf[1] + _vrx_buf[2] + _vrx_buf[3]) >> 2
+        vry_value = (_vry_buf[0] + _vry_buf[1] + _vry_buf[2] + _vry_buf[3]) >> 2
 
         # 获取按钮SW的状态
         sw_state = sw.value()  # 按钮状态：0为按下，1为未按下
@@ -2,14 +2,22 @@
 # ESP32 12舵机4足蜘蛛机器人调试代码
 
 import time
+from array import array
 from machine import Pin, PWM
+from micropython import const
 from base.log import debug, info, warn
 
+# 编译期调试开关：const(0) 让 mpy 编译器在加载时直接裁掉整个
+# if 分支，舵机热路径上连 debug() 的参数求值都不会发生；
+# 需要逐次写入日志时改成 const(1) 重新部署
+_LOG_DEBUG = const(0)
+
 # ======================
 # 蜘蛛机器人舵机配置
 # ======================
 FREQ = 50               # 舵机固定频率 50Hz
-PWM_MAX = 1023         # ESP32 PWM 通道：duty范围 0~1023
+PWM_MAX = 65535        # duty_u16 满量程：16位分辨率，角度步进约0.005°
+                       # (10位 duty() 只有约0.35°一步，还多一次内部重缩放)
 
 # 180度舵机脉宽参数（根据实际舵机调试）
 MIN_US = 1000          # 最小脉宽 1.0ms (0度)
@@ -48,15 +56,39 @@ ANGLE_LIMITS = {
     'KNEE': {'min': 60, 'max': 120}      # 膝关节角度限制
 }
 
+# 每种关节的角度->duty查表，导入时一次算完 181 个值。
+# ESP32 的 MicroPython 浮点全靠软件模拟，热路径上每次舵机写入都做
+# 两次浮点乘除很亏；查表后一次下标加载就拿到 duty
+DUTY_TABLES = {
+    jt: array('H', (int(PWM_MAX * (MIN_US + (MAX_US - MIN_US) * a / 180) / 20000)
+                    for a in range(181)))
+    for jt in ANGLE_LIMITS
+}
+
 # 初始化舵机对象
 servos = {}
 
+# (leg, joint) -> (绑定的duty方法, 角度下限, 角度上限, duty查表)。
+# 热路径一次元组查找拿全所需数据，省掉 f-string 拼 key、servos 字典
+# 和 ANGLE_LIMITS 的逐层查找；存绑定方法连属性解析和方法绑定的开销
+# 也一并省掉（12舵机 x 插值步数会放大这笔账）
+SERVO_TBL = {}
+
 # 创建GPIO引脚到舵机标识的反向映射
 GPIO_TO_SERVO = {}
 for leg_name, leg_config in LEGS_CONFIG.items():
     for joint_name, pin in leg_config.items():
         GPIO_TO_SERVO[pin] = f"{leg_name}_{joint_name}"
 
+# 舵机信息串一次算好：get_servo_info / format_servo_key_with_pin
+# 在每次动作（含日志路径）都被调用，反复拼 2~3 个 f-string 纯属
+# 给 GC 制造碎片，这里退化成 O(1) 字典取现成字符串
+SERVO_INFO_STR = {
+    (leg, jn): f"{leg}_{jn}(GPIO{p})"
+    for leg, cfg in LEGS_CONFIG.items() for jn, p in cfg.items()
+}
+SERVO_INFO_BY_KEY = {f"{leg}_{jn}": s for (leg, jn), s in SERVO_INFO_STR.items()}
+
 # ======================
 # 舵机初始化
 # ======================
@@ -68,11 +100,22 @@ def init_servos():
         for joint_name, pin in leg_config.items():
             servo_key = f"{leg_name}_{joint_name}"
             try:
-                servos[servo_key] = PWM(Pin(pin), freq=FREQ, duty=0)
+                servos[servo_key] = PWM(Pin(pin), freq=FREQ)
+                servos[servo_key].duty_u16(0)
                 info("SERVO", "舵机已初始化: %s -> GPIO%d", servo_key, pin)
             except Exception as e:
                 warn("SERVO", "舵机初始化失败: %s -> GPIO%d, 错误: %s", servo_key, pin, str(e))
 
+    # 初始化成功的舵机进平铺表
+    SERVO_TBL.clear()
+    for leg_name, leg_config in LEGS_CONFIG.items():
+        for joint_name in leg_config:
+            if f"{leg_name}_{joint_name}" in servos:
+                lim = ANGLE_LIMITS[joint_name]
+                SERVO_TBL[(leg_name, joint_name)] = (
+                    servos[f"{leg_name}_{joint_name}"].duty_u16,
+                    lim['min'], lim['max'], DUTY_TABLES[joint_name])
+
     info("INIT", "舵机初始化完成，共%d个舵机", len(servos))
     return len(servos) == 12
 
@@ -81,20 +124,20 @@ def init_servos():
 # ======================
 def angle_to_duty(angle, joint_type):
     """
-    角度转换为PWM duty
+    角度转换为PWM duty (查预计算表，无浮点运算)
     angle: 0-180度
     joint_type: 关节类型 (HIP, THIGH, KNEE)
     """
-    # 应用角度限制
-    limits = ANGLE_LIMITS.get(joint_type, {'min': 0, 'max': 180})
-    angle = max(limits['min'], min(limits['max'], angle))
-
-    # 角度转换为脉宽
-    us = MIN_US + (MAX_US - MIN_US) * angle / 180
-    duty = int(PWM_MAX * us / 20000)  # 20ms = 20000us
-
-    debug("CALC", "%s关节: 角度=%d° -> 脉宽=%.1fus -> duty=%d", joint_type, angle, us, duty)
-    return duty
+    # 应用角度限制后直接查表
+    limits = ANGLE_LIMITS.get(joint_type)
+    if limits is not None:
+        lo = limits['min']
+        hi = limits['max']
+        a = lo if angle < lo else hi if angle > hi else int(angle)
+        return DUTY_TABLES[joint_type][a]
+    # 未知关节类型：只按物理范围0-180夹取，查任意一张表都一样
+    a = 0 if angle < 0 else 180 if angle > 180 else int(angle)
+    return DUTY_TABLES['HIP'][a]
 
 # ======================
 # 单个舵机控制
@@ -107,18 +150,13 @@ def get_servo_pin(leg, joint):
         return -1
 
 def get_servo_info(leg, joint):
-    """获取舵机详细信息字符串"""
-    pin = get_servo_pin(leg, joint)
-    servo_key = f"{leg}_{joint}"
-    return f"{servo_key}(GPIO{pin})"
+    """获取舵机详细信息字符串 (预生成缓存)"""
+    s = SERVO_INFO_STR.get((leg, joint))
+    return s if s is not None else f"{leg}_{joint}(GPIO-1)"
 
 def format_servo_key_with_pin(servo_key):
-    """格式化舵机标识，包含GPIO信息"""
-    if '_' in servo_key:
-        leg, joint = servo_key.split('_', 1)
-        pin = get_servo_pin(leg, joint)
-        return f"{servo_key}(GPIO{pin})"
-    return servo_key
+    """格式化舵机标识，包含GPIO信息 (预生成缓存)"""
+    return SERVO_INFO_BY_KEY.get(servo_key, servo_key)
 
 def set_servo_angle(leg, joint, angle, speed_ms=0):
     """
@@ -128,28 +166,27 @@ def set_servo_angle(leg, joint, angle, speed_ms=0):
     angle: 目标角度
     speed_ms: 移动时间(毫秒)，0表示立即设置
     """
-    servo_key = f"{leg}_{joint}"
-    servo_info = get_servo_info(leg, joint)
-
-    if servo_key not in servos:
-        warn("SERVO", "舵机不存在: %s", servo_info)
+    entry = SERVO_TBL.get((leg, joint))
+    if entry is None:
+        warn("SERVO", "舵机不存在: %s", get_servo_info(leg, joint))
         return False
 
-    try:
-        duty = angle_to_duty(angle, joint)
+    duty_fn, lo, hi, tbl = entry
+    a = lo if angle < lo else hi if angle > hi else int(angle)
 
+    try:
+        duty = tbl[a]
+        duty_fn(duty)
         if speed_ms > 0:
             # 平滑移动（简化版本，实际应用中需要更复杂的插值）
-            servos[servo_key].duty(duty)
-            time.sleep(speed_ms / 1000.0)
-        else:
-            servos[servo_key].duty(duty)
+            time.sleep_ms(speed_ms)
 
-        debug("SERVO", "设置舵机: %s 角度=%d° duty=%d", servo_info, angle, duty)
+        if _LOG_DEBUG:
+            debug("SERVO", "设置舵机: %s_%s 角度=%d° duty=%d", leg, joint, angle, duty)
         return True
 
     except Exception as e:
-        warn("SERVO", "设置舵机失败: %s, 错误: %s", servo_info, str(e))
+        warn("SERVO", "设置舵机失败: %s, 错误: %s", get_servo_info(leg, joint), str(e))
         return False
 
 # ======================
@@ -179,11 +216,52 @@ def set_leg_angles(leg, hip_angle=None, thigh_angle=None, knee_angle=None, speed
             success_count += 1
             angle_parts.append(f"KNEE:{knee_angle}°")
 
-    if angle_parts:
+    if _LOG_DEBUG and angle_parts:
         debug("LEG", "%s腿设置角度: %s (耗时%dms)", leg, ", ".join(angle_parts), speed_ms)
 
     return success_count
 
+def set_leg_angles_fast(leg, hip=None, thigh=None, knee=None, speed_ms=0, steps=20):
+    """
+    批量插值控制一条腿的多个关节
+    先算好全部目标duty，再在同一个时间片循环里同步推进各关节。
+    逐关节走 set_servo_angle 时每个关节各睡 speed_ms，三关节串行
+    要花 3*speed_ms；这里整条腿只花 speed_ms，PWM 写入次序不变
+    """
+    triples = []
+    for joint, angle in (('HIP', hip), ('THIGH', thigh), ('KNEE', knee)):
+        if angle is None:
+            continue
+        entry = SERVO_TBL.get((leg, joint))
+        if entry is None:
+            warn("SERVO", "舵机不存在: %s", get_servo_info(leg, joint))
+            continue
+        duty_fn, lo, hi, tbl = entry
+        a = lo if angle < lo else hi if angle > hi else int(angle)
+        # 插值起点取当前duty，但上电后还没写过的通道读出来是0，
+        # 从0爬坡会先发出远低于MIN_US的脉冲把舵机顶向机械限位；
+        # 低于该关节表最小值时直接跳到目标，不发中间非法脉宽
+        cur = duty_fn()
+        if cur < tbl[lo]:
+            cur = tbl[a]
+        triples.append((duty_fn, cur, tbl[a]))
+
+    if not triples:
+        return 0
+
+    if speed_ms <= 0:
+        for duty_fn, _cur, tgt in triples:
+            duty_fn(tgt)
+        return len(triples)
+
+    dt = max(1, speed_ms // steps)
+    for s in range(1, steps + 1):
+        frac = s / steps
+        for duty_fn, cur, tgt in triples:
+            duty_fn(int(cur + (tgt - cur) * frac))
+        time.sleep_ms(dt)
+    return len(triples)
+
 # ======================
 # 姿势控制
 # ======================
@@ -200,13 +278,11 @@ def stand_up_pose(speed_ms=1000):
     }
 
     for leg, angles in stand_angles.items():
-        set_leg_angles(leg,
-                      hip_angle=angles['HIP'],
-                      thigh_angle=angles['THIGH'],
-                      knee_angle=angles['KNEE'],
-                      speed_ms=speed_ms)
-
-    time.sleep(speed_ms / 1000.0)
+        set_leg_angles_fast(leg,
+                            hip=angles['HIP'],
+                            thigh=angles['THIGH'],
+                            knee=angles['KNEE'],
+                            speed_ms=speed_ms)
     info("POSE", "站立姿势完成")
 
 def sit_pose(speed_ms=1000):
@@ -222,13 +298,11 @@ def sit_pose(speed_ms=1000):
     }
 
     for leg, angles in sit_angles.items():
-        set_leg_angles(leg,
-                      hip_angle=angles['HIP'],
-                      thigh_angle=angles['THIGH'],
-                      knee_angle=angles['KNEE'],
-                      speed_ms=speed_ms)
-
-    time.sleep(speed_ms / 1000.0)
+        set_leg_angles_fast(leg,
+                            hip=angles['HIP'],
+                            thigh=angles['THIGH'],
+                            knee=angles['KNEE'],
+                            speed_ms=speed_ms)
     info("POSE", "坐下姿势完成")
 
 def crouch_pose(speed_ms=1000):
@@ -243,41 +317,78 @@ def crouch_pose(speed_ms=1000):
     }
 
     for leg, angles in crouch_angles.items():
-        set_leg_angles(leg,
-                      hip_angle=angles['HIP'],
-                      thigh_angle=angles['THIGH'],
-                      knee_angle=angles['KNEE'],
-                      speed_ms=speed_ms)
-
-    time.sleep(speed_ms / 1000.0)
+        set_leg_angles_fast(leg,
+                            hip=angles['HIP'],
+                            thigh=angles['THIGH'],
+                            knee=angles['KNEE'],
+                            speed_ms=speed_ms)
     info("POSE", "蹲下姿势完成")
 
 # ======================
 # 步态模式
 # ======================
+# 步态调度表：整个步态周期的 (等待ms, [(duty方法, duty值)...], 提示语)
+# 一次编译好，回放循环里只剩下标调用和 sleep_ms —— 不再每步穿过
+# set_leg_angles -> set_servo_angle 的字典查找/字符串拼装/日志链路
+def _gait_op(leg, joint, angle):
+    entry = SERVO_TBL.get((leg, joint))
+    if entry is None:
+        return None
+    duty_fn, lo, hi, tbl = entry
+    a = lo if angle < lo else hi if angle > hi else int(angle)
+    return (duty_fn, tbl[a])
+
+def _gait_ops(*moves):
+    return [op for op in (_gait_op(*m) for m in moves) if op is not None]
+
+def build_wave_schedule(start_leg, step_count, speed_ms):
+    """编译波浪步态调度表"""
+    gait_sequence = ('FL', 'BR', 'FR', 'BL')
+    start_index = gait_sequence.index(start_leg) if start_leg in gait_sequence else 0
+
+    sched = []
+    for step in range(step_count):
+        leg = gait_sequence[(start_index + step) % 4]
+        # 抬腿（膝关节伸直，大腿关节向前），再放腿回站立位
+        sched.append((speed_ms,
+                      _gait_ops((leg, 'KNEE', 60), (leg, 'THIGH', 45)),
+                      f"第{step + 1}步: 抬起{leg}腿"))
+        sched.append((speed_ms,
+                      _gait_ops((leg, 'KNEE', 90), (leg, 'THIGH', 90)),
+                      None))
+    return sched
+
+def build_tripod_schedule(step_count, speed_ms):
+    """编译三脚步态调度表 (对角腿成组)"""
+    sched = []
+    for step in range(step_count):
+        pair = ('FL', 'BR') if step % 2 == 0 else ('FR', 'BL')
+        a, b = pair
+        sched.append((speed_ms,
+                      _gait_ops((a, 'KNEE', 60), (a, 'THIGH', 45),
+                                (b, 'KNEE', 60), (b, 'THIGH', 45)),
+                      f"第{step + 1}步: {a}和{b}腿抬起"))
+        sched.append((speed_ms,
+                      _gait_ops((a, 'KNEE', 90), (a, 'THIGH', 90),
+                                (b, 'KNEE', 90), (b, 'THIGH', 90)),
+                      None))
+    return sched
+
+def _play_schedule(sched):
+    for delay, ops, msg in sched:
+        if msg:
+            print(msg)
+        for fn, d in ops:
+            fn(d)
+        time.sleep_ms(delay)
+
 def wave_gait(leg, step_count=4, speed_ms=500):
     """
     波浪步态 - 一次抬起一条腿
     leg: 开始的腿 ('FL', 'FR', 'BL', 'BR')
     """
     info("GAIT", "开始波浪步态，起始腿: %s", leg)
-
-    # 步态序列：FL -> BR -> FR -> BL -> FL
-    gait_sequence = ['FL', 'BR', 'FR', 'BL']
-    start_index = gait_sequence.index(leg) if leg in gait_sequence else 0
-
-    for step in range(step_count):
-        current_leg = gait_sequence[(start_index + step) % 4]
-
-        print(f"第{step + 1}步: 抬起{current_leg}腿")
-        # 抬腿（膝关节伸直，大腿关节向前）
-        set_leg_angles(current_leg, knee_angle=60, thigh_angle=45, speed_ms=speed_ms//2)
-        time.sleep(speed_ms / 1000.0)
-
-        # 放腿（回到站立位置）
-        set_leg_angles(current_leg, knee_angle=90, thigh_angle=90, speed_ms=speed_ms//2)
-        time.sleep(speed_ms / 1000.0)
-
+    _play_schedule(build_wave_schedule(leg, step_count, speed_ms))
     info("GAIT", "波浪步态完成")
 
 def tripod_gait(step_count=4, speed_ms=800):
@@ -285,29 +396,7 @@ def tripod_gait(step_count=4, speed_ms=800):
     三脚步态 - 对角腿同时移动
     """
     info("GAIT", "开始三脚步态...")
-
-    for step in range(step_count):
-        if step % 2 == 0:
-            # 第1组：FL和BR抬起
-            print(f"第{step + 1}步: FL和BR腿抬起")
-            set_leg_angles('FL', knee_angle=60, thigh_angle=45, speed_ms=speed_ms//2)
-            set_leg_angles('BR', knee_angle=60, thigh_angle=45, speed_ms=speed_ms//2)
-            time.sleep(speed_ms / 1000.0)
-
-            set_leg_angles('FL', knee_angle=90, thigh_angle=90, speed_ms=speed_ms//2)
-            set_leg_angles('BR', knee_angle=90, thigh_angle=90, speed_ms=speed_ms//2)
-        else:
-            # 第2组：FR和BL抬起
-            print(f"第{step + 1}步: FR和BL腿抬起")
-            set_leg_angles('FR', knee_angle=60, thigh_angle=45, speed_ms=speed_ms//2)
-            set_leg_angles('BL', knee_angle=60, thigh_angle=45, speed_ms=speed_ms//2)
-            time.sleep(speed_ms / 1000.0)
-
-            set_leg_angles('FR', knee_angle=90, thigh_angle=90, speed_ms=speed_ms//2)
-            set_leg_angles('BL', knee_angle=90, thigh_angle=90, speed_ms=speed_ms//2)
-
-        time.sleep(speed_ms / 1000.0)
-
+    _play_schedule(build_tripod_schedule(step_count, speed_ms))
     info("GAIT", "三脚步态完成")
 
 def turn_left(speed_ms=600):
@@ -323,13 +412,12 @@ def turn_left(speed_ms=600):
     }
 
     for leg, angles in turn_angles.items():
-        set_leg_angles(leg,
-                      hip_angle=90,
-                      thigh_angle=angles['THIGH'],
-                      knee_angle=angles['KNEE'],
-                      speed_ms=speed_ms)
+        set_leg_angles_fast(leg,
+                            hip=90,
+                            thigh=angles['THIGH'],
+                            knee=angles['KNEE'],
+                            speed_ms=speed_ms)
 
-    time.sleep(speed_ms / 1000.0)
     stand_up_pose(speed_ms)
     info("GAIT", "左转完成")
 
@@ -346,13 +434,12 @@ def turn_right(speed_ms=600):
     }
 
     for leg, angles in turn_angles.items():
-        set_leg_angles(leg,
-                      hip_angle=90,
-                      thigh_angle=angles['THIGH'],
-                      knee_angle=angles['KNEE'],
-                      speed_ms=speed_ms)
+        set_leg_angles_fast(leg,
+                            hip=90,
+                            thigh=angles['THIGH'],
+                            knee=angles['KNEE'],
+                            speed_ms=speed_ms)
 
-    time.sleep(speed_ms / 1000.0)
     stand_up_pose(speed_ms)
     info("GAIT", "右转完成")
 
@@ -405,7 +492,7 @@ def test_individual_leg():
         for hip, thigh, knee, desc in test_sequence:
             print(f"  {desc}: HIP={hip}° THIGH={thigh}° KNEE={knee}°")
             set_leg_angles(leg, hip, thigh, knee, speed_ms=500)
-            time.sleep(1)
+            time.sleep_ms(1000)
 
         print("✅ 单腿测试完成")
 
@@ -427,7 +514,7 @@ def test_all_servos():
                 servo_info = format_servo_key_with_pin(servo_key)
                 print(f"  {servo_info} 设置到 90°")
 
-    time.sleep(2)
+    time.sleep_ms(2000)
 
     # 测试所有舵机的极限位置
     test_angles = [(60, "最小"), (120, "最大")]
@@ -437,7 +524,7 @@ def test_all_servos():
         for leg in LEGS_CONFIG.keys():
             for joint in ['HIP', 'THIGH', 'KNEE']:
                 set_servo_angle(leg, joint, angle, speed_ms=200)
-        time.sleep(2)
+        time.sleep_ms(2000)
 
     # 回到中间位置
     stand_up_pose()
@@ -592,7 +679,7 @@ def debug_leg_by_gpio(hip_gpio, thigh_gpio, knee_gpio, speed_ms=500):
                 set_servo_angle(leg, joint, knee_angle, current_speed)
                 print(f"    ✅ {knee_servo}(GPIO{knee_gpio}) -> {knee_angle}°")
 
-            time.sleep(current_speed / 1000.0 + 0.5)  # 动作时间+暂停
+            time.sleep_ms(current_speed + 500)  # 动作时间+暂停
 
         print(f"✅ {leg_name} 腿调试完成")
         return True
@@ -647,7 +734,7 @@ def debug_all_legs_sequentially(speed='fast'):
         except Exception as e:
             print(f"❌ {leg_name} 调试异常: {e}")
 
-        time.sleep(1)  # 腿之间的间隔
+        time.sleep_ms(1000)  # 腿之间的间隔
 
     print(f"\n🎯 所有腿调试完成，成功: {success_count}/4")
     return success_count == 4
@@ -730,6 +817,42 @@ def diagonal_up_fr_bl():
 # ======================
 # 主程序
 # ======================
+
+# 菜单分发表：代替 run() 里 ~25 层的 elif 梯子。O(1) 查找、
+# 字节码小一截，新菜单项加一行就够，本身也是菜单的速查文档
+ACTIONS = {
+    # 基础控制
+    1: stand_up_pose,
+    2: sit_pose,
+    3: crouch_pose,
+    4: test_single_servo,
+    5: test_individual_leg,
+    6: test_all_servos,
+    7: calibration_mode,
+    # 步态控制
+    11: lambda: wave_gait('FL'),
+    12: lambda: wave_gait('FR'),
+    13: lambda: wave_gait('BL'),
+    14: lambda: wave_gait('BR'),
+    15: tripod_gait,
+    16: turn_left,
+    17: turn_right,
+    # 快速动作
+    21: legs_forward,
+    22: legs_backward,
+    23: left_side_up,
+    24: right_side_up,
+    25: diagonal_up_fl_br,
+    26: diagonal_up_fr_bl,
+    # 腿部单独调试
+    31: debug_leg_fl,
+    32: debug_leg_fr,
+    33: debug_leg_bl,
+    34: debug_leg_br,
+    35: debug_all_legs_sequentially,
+    36: custom_gpio_debug,
+}
+
 def run():
     """主运行函数"""
     try:
@@ -762,68 +885,11 @@ def run():
                 print("👋 程序退出中...")
                 break
 
-            # 基础控制
-            elif choice == 1:
-                stand_up_pose()
-            elif choice == 2:
-                sit_pose()
-            elif choice == 3:
-                crouch_pose()
-            elif choice == 4:
-                test_single_servo()
-            elif choice == 5:
-                test_individual_leg()
-            elif choice == 6:
-                test_all_servos()
-            elif choice == 7:
-                calibration_mode()
-
-            # 腿部单独调试
-            elif choice == 31:
-                debug_leg_fl()
-            elif choice == 32:
-                debug_leg_fr()
-            elif choice == 33:
-                debug_leg_bl()
-            elif choice == 34:
-                debug_leg_br()
-            elif choice == 35:
-                debug_all_legs_sequentially()
-            elif choice == 36:
-                custom_gpio_debug()
-
-            # 步态控制
-            elif choice == 11:
-                wave_gait('FL')
-            elif choice == 12:
-                wave_gait('FR')
-            elif choice == 13:
-                wave_gait('BL')
-            elif choice == 14:
-                wave_gait('BR')
-            elif choice == 15:
-                tripod_gait()
-            elif choice == 16:
-                turn_left()
-            elif choice == 17:
-                turn_right()
-
-            # 快速动作
-            elif choice == 21:
-                legs_forward()
-            elif choice == 22:
-                legs_backward()
-            elif choice == 23:
-                left_side_up()
-            elif choice == 24:
-                right_side_up()
-            elif choice == 25:
-                diagonal_up_fl_br()
-            elif choice == 26:
-                diagonal_up_fr_bl()
-
-            else:
+            fn = ACTIONS.get(choice)
+            if fn is None:
                 print("❌ 无效选择，请输入有效数字")
+            else:
+                fn()
 
             # 清理当前行，准备下次菜单显示
             print("\n按回车键继续...")
@@ -841,9 +907,9 @@ def run():
         info("MAIN", "清理舵机资源...")
         for servo_key, servo in servos.items():
             try:
-                servo.duty(0)
-                servo_info = format_servo_key_with_pin(servo_key)
-                debug("CLEAN", "关闭舵机信号: %s", servo_info)
+                servo.duty_u16(0)
+                if _LOG_DEBUG:
+                    debug("CLEAN", "关闭舵机信号: %s", format_servo_key_with_pin(servo_key))
             except:
                 pass
 
@@ -868,21 +934,21 @@ def quick_test():
         # 1. 站立测试
         print("\n1. 站立姿势测试...")
         stand_up_pose(speed_ms=1000)
-        time.sleep(1)
+        time.sleep_ms(1000)
 
         # 2. 单腿测试
         print("\n2. 单腿测试 (FL腿)...")
         set_leg_angles('FL', 60, 45, 60, speed_ms=500)
-        time.sleep(1)
+        time.sleep_ms(1000)
         set_leg_angles('FL', 90, 90, 90, speed_ms=500)
-        time.sleep(1)
+        time.sleep_ms(1000)
 
         # 3. 姿势切换测试
         print("\n3. 姿势切换测试...")
         sit_pose(speed_ms=800)
-        time.sleep(1)
+        time.sleep_ms(1000)
         stand_up_pose(speed_ms=800)
-        time.sleep(1)
+        time.sleep_ms(1000)
 
         # 4. 简单步态测试
         print("\n4. 简单步态测试...")
@@ -20,6 +20,8 @@ RELEASE_WHEN_IDLE = True
 DIR_INVERT = False
 
 ANGLE_MAP = {1:+90, 2:+180, 3:-90, 4:+360}
+# 展开成按键序号索引的元组：热路径取角度变成下标加载，不走字典哈希
+_ANGLES = tuple(ANGLE_MAP[i + 1] for i in range(4))
 
 HALFSTEP_SEQ = (
     (1,0,0,0),
@@ -41,7 +43,9 @@ seq_idx = 0
 steps_remaining = 0
 last_step_us = 0
 _last_k_ms = [0,0,0,0]
-_pending =   [0,0,0,0]
+# 待处理按键合并成一个位掩码：主循环每圈一次整数判零即可知道
+# 有没有兜底工作，代替逐个探 4 个列表元素
+_pending = 0
 
 # ========== 步进电机基本操作 ==========
 def _write(a,b,c,d):
@@ -75,9 +79,10 @@ def step_once(direction):
 
 # ========== Soft Handler（软件中断） ==========
 def _process_soft(i):
+    global _pending
     debug("SOFT", "进入 soft handler: K%d", i+1)
 
-    _pending[i] = 0
+    _pending &= ~(1 << i)
     now = time.ticks_ms()
 
     if time.ticks_diff(now, _last_k_ms[i]) < DEBOUNCE_MS:
@@ -90,14 +95,17 @@ def _process_soft(i):
     debug("SOFT", "K%d 软处理中读取 key value=%d", i+1, key_val)
 
     if key_val == 0:
-        deg = ANGLE_MAP[i+1]
+        deg = _ANGLES[i]
         debug("KEY", "K%d 按下 -> 目标角度 %+d°", i+1, deg)
         enqueue(angle_to_steps(deg))
 
 
 # ========== IRQ Handler（硬件中断） ==========
 def _mk_irq(i):
+    bit = 1 << i
+
     def irq(pin):
+        global _pending
         debug("IRQ", "IRQ 触发: K%d (pin value=%d)", i+1, pin.value())
 
         now = time.ticks_ms()
@@ -107,8 +115,8 @@ def _mk_irq(i):
         #
         # _last_k_ms[i] = now
 
-        if not _pending[i]:
-            _pending[i] = 1
+        if not _pending & bit:
+            _pending |= bit
             debug("IRQ", "K%d schedule soft handler", i+1)
             try:
                 micropython.schedule(lambda _: _process_soft(i), 0)
@@ -158,11 +166,13 @@ def run():
     last_hb = time.ticks_ms()
 
     while True:
-        # 如果 schedule 忙，兜底处理 pending
-        for i2 in range(4):
-            if _pending[i2]:
-                debug("MAIN", "兜底处理 pending: K%d", i2+1)
-                _process_soft(i2)
+        # 如果 schedule 忙，兜底处理 pending：先一次判零，有位才展开
+        p = _pending
+        if p:
+            for i2 in range(4):
+                if p & (1 << i2):
+                    debug("MAIN", "兜底处理 pending: K%d", i2+1)
+                    _process_soft(i2)
 
         # 步进任务调度
         if steps_remaining != 0:
@@ -0,0 +1,35 @@
+# manifest.py
+# MicroPython 冻结字节码清单：把常驻模块编进固件，
+# 跳过每次复位后的源码解析/编译，也能省下解析用的堆内存。
+#
+# 用法（在 micropython/ports/esp32 下）：
+#   make BOARD=ESP32_GENERIC FROZEN_MANIFEST=/path/to/esp32-wroom-practice/manifest.py
+#
+# 不想重编固件时的替代方案：用 mpy-cross 预编译后放到 /lib 下，
+# import 机制会优先选 .mpy：
+#   mpy-cross -O3 base/log.py && mpy-cross -O3 base/display.py
+
+include("$(PORT_DIR)/boards/manifest.py")
+
+# 常驻的基础模块
+package("base", base_path="..")
+
+# OLED / 外设驱动
+module("ssd1306.py", base_path="../lib")
+
+# 摄像头相关常驻模块：服务器和 AP 配网一起冻结，
+# 复位后不再在 RAM 里解析/编译这几个最大的源文件
+module("camera_setup.py", base_path="../camera_http")
+module("http_server.py", base_path="../camera_http")
+module("wifi_ap.py", base_path="../camera_http")
+
+# V2 (camera_stream) 的静态页面资源: 冻结后整包响应住在flash
+module("html_assets.py", base_path="../camera_stream")
+
+# WiFi/BLE 常驻模块: 每次复位从 LittleFS 解析+编译各要 100~300ms，
+# 冻结后字节码直接在 flash 里 XIP 执行，文档字符串/常量也不占 RAM。
+# wifi_sta 取 V2 (camera_stream) 版本做顶层模块；snic_bee 里的同名
+# 文件走包命名空间 (snic_bee.wifi_sta)，两者互不冲突
+module("wifi_sta.py", base_path="../camera_stream")
+module("ble_wifi.py", base_path="../examples")
+package("snic_bee", base_path="..")
@@ -106,7 +106,12 @@ UPLOAD_INTERVAL_MS = _scaled_interval_ms(UPLOAD_INTERVAL_BASE_MS, min_ms=800)  #
 DEVICE_NAME = "snic_bee"
 
 
-from machine import Pin, PWM
+from machine import Pin, PWM, time_pulse_us
+
+try:
+    from machine import RMT
+except ImportError:
+    RMT = None
 import time
 
 import machine
@@ -127,11 +132,24 @@ except Exception:
 class SonicBuzzerSystem:
     """使用超声波距离控制蜂鸣器频率和节奏。"""
 
+    # 脉宽(us) -> 距离(cm)：0.0343/2，预先算好避免热路径里的除法
+    _US_TO_CM = 0.01715
+
     def __init__(self, trig_pin=ULTRASONIC_TRIG_PIN, echo_pin=ULTRASONIC_ECHO_PIN, buzzer_pin=BUZZER_PWM_PIN):
         self.trig = Pin(trig_pin, Pin.OUT)
         self.echo = Pin(echo_pin, Pin.IN)
         self.buzzer = PWM(Pin(buzzer_pin, Pin.OUT), freq=1000, duty=0)
 
+        # 触发脉冲交给 RMT 外设 (clock_div=80 -> 1us 一拍)：
+        # 三连 value()/sleep_us() 每步都有 15~30us 解释器开销，
+        # "10us" 实际被拉到 40us+ 且随 GC 抖动；硬件发波 ±1us 且不占 CPU
+        self._rmt = None
+        if RMT is not None:
+            try:
+                self._rmt = RMT(0, pin=self.trig, clock_div=80)
+            except Exception as e:
+                self.log("rmt unavailable, fallback to bit-bang trig: {}".format(e))
+
         # 核心运行参数
         self.min_distance = ULTRASONIC_MIN_DISTANCE_CM
         self.max_distance = ULTRASONIC_MAX_DISTANCE_CM  # 安全检测上限，单位 cm
@@ -175,36 +193,27 @@ class SonicBuzzerSystem:
 
     def measure_distance_cm(self):
         """通过 HC-SR04 测距，超时返回 None。"""
-        self.trig.value(0)
-        time.sleep_us(2)
-        self.trig.value(1)
-        time.sleep_us(10)
-        self.trig.value(0)
-
-        timeout_us = ULTRASONIC_ECHO_TIMEOUT_US
-
-        start_wait = time.ticks_us()
-        while self.echo.value() == 0:
-            machine.idle()
-            if time.ticks_diff(time.ticks_us(), start_wait) > timeout_us:
-                self.timeout_count += 1
-                if self.timeout_count % self.timeout_log_every == 0:
-                    self.log("echo wait timeout #{}".format(self.timeout_count))
-                return None
-        pulse_start = time.ticks_us()
-
-        while self.echo.value() == 1:
-            machine.idle()
-            if time.ticks_diff(time.ticks_us(), pulse_start) > timeout_us:
-                self.timeout_count += 1
-                if self.timeout_count % self.timeout_log_every == 0:
-                    self.log("echo high timeout #{}".format(self.timeout_count))
-                return None
-        pulse_end = time.ticks_us()
-
-        pulse_width = time.ticks_diff(pulse_end, pulse_start)
-        distance = (pulse_width * 0.0343) / 2
-        return distance
+        if self._rmt is not None:
+            # 硬件精确输出一个 10us 高脉冲，结束自动回低
+            self._rmt.write_pulses((10,), 1)
+        else:
+            self.trig.value(0)
+            time.sleep_us(2)
+            self.trig.value(1)
+            time.sleep_us(10)
+            self.trig.value(0)
+
+        # time_pulse_us 在 C 层等待并测量回波脉宽：Python 级 pin.value()
+        # 单次就要 ~20us，而 HC-SR04 约 58us/cm，轮询方式近距离误差很大，
+        # 还要跑上万条字节码。超时返回 -1/-2，统一按测距失败处理。
+        pulse_width = time_pulse_us(self.echo, 1, ULTRASONIC_ECHO_TIMEOUT_US)
+        if pulse_width < 0:
+            self.timeout_count += 1
+            if self.timeout_count % self.timeout_log_every == 0:
+                self.log("echo timeout #{}".format(self.timeout_count))
+            return None
+
+        return pulse_width * self._US_TO_CM
 
     def _map_distance(self, d):
         """将距离映射为蜂鸣器行为。
@@ -358,13 +367,18 @@ class SnicBeeTelemetryApp:
         self._last_upload_ms = 0
         self._last_wifi_check_ms = 0
 
+        # 复用同一个 payload 字典: 上传节奏下每圈新建+update 两个字典
+        # 纯属喂 GC, 改为原地覆写固定键
+        self._payload = {}
+
     def _payload_base(self):
-        return {
-            "device": DEVICE_NAME,
-            "device_id": self.device_id,
-            "ts_ms": utc_ms_fallback(),
-            "uptime_ms": time.ticks_ms(),
-        }
+        p = self._payload
+        p.clear()
+        p["device"] = DEVICE_NAME
+        p["device_id"] = self.device_id
+        p["ts_ms"] = utc_ms_fallback()
+        p["uptime_ms"] = time.ticks_ms()
+        return p
 
     def _ensure_wifi(self):
         now = time.ticks_ms()
@@ -575,30 +589,22 @@ def main():
             # Water event: upload immediately
             if water_event and app.upload_enabled:
                 payload = app._payload_base()
-                payload.update(
-                    {
-                        "type": "event",
-                        "event": "water_drop",
-                        "water_active": 1 if (app.water is not None and app.water.is_active()) else 0,
-                        "distance_cm": None if distance_cm is None else round(distance_cm, 1),
-                    }
-                )
+                payload["type"] = "event"
+                payload["event"] = "water_drop"
+                payload["water_active"] = 1 if (app.water is not None and app.water.is_active()) else 0
+                payload["distance_cm"] = None if distance_cm is None else round(distance_cm, 1)
                 app._upload(payload)
 
             # Periodic telemetry
             if app.upload_enabled and time.ticks_diff(now, app._last_upload_ms) >= UPLOAD_INTERVAL_MS:
                 app._last_upload_ms = now
                 payload = app._payload_base()
-                payload.update(
-                    {
-                        "type": "telemetry",
-                        "distance_cm": None if distance_cm is None else round(distance_cm, 1),
-                        "water_active": 1 if (app.water is not None and app.water.is_active()) else 0,
-                        "distance_enabled": 1 if app.system is not None else 0,
-                        "water_enabled": 1 if app.water is not None else 0,
-                        "wifi_ip": app.wifi.get_ip(),
-                    }
-                )
+                payload["type"] = "telemetry"
+                payload["distance_cm"] = None if distance_cm is None else round(distance_cm, 1)
+                payload["water_active"] = 1 if (app.water is not None and app.water.is_active()) else 0
+                payload["distance_enabled"] = 1 if app.system is not None else 0
+                payload["water_enabled"] = 1 if app.water is not None else 0
+                payload["wifi_ip"] = app.wifi.get_ip()
                 app._upload(payload)
     except KeyboardInterrupt:
         print("[snic_bee] stopped by user")